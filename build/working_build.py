@@ -15,6 +15,28 @@ from pathlib import Path
 # Add backend path for all the working services
 sys.path.insert(0, '/Users/hirakbanerjee/Desktop/SwiftGen_Clean/stable_reference/backend')
 
+# Cached result of the Simulator.app process check: (checked_at, is_running)
+_SIMULATOR_RUNNING_TTL = 30.0
+_simulator_running_cache: Optional[tuple] = None
+
+
+def _simulator_app_running() -> bool:
+    """Check whether Simulator.app is already running (cached for 30s)"""
+    global _simulator_running_cache
+    now = time.monotonic()
+    if _simulator_running_cache and now - _simulator_running_cache[0] < _SIMULATOR_RUNNING_TTL:
+        return _simulator_running_cache[1]
+    
+    try:
+        result = subprocess.run(['pgrep', '-x', 'Simulator'], capture_output=True, timeout=2)
+        running = result.returncode == 0
+    except (OSError, subprocess.SubprocessError):
+        running = False
+    
+    _simulator_running_cache = (now, running)
+    return running
+
+
 class WorkingBuildService:
     """
     The build service that was actually working on July 15
@@ -31,7 +53,7 @@ class WorkingBuildService:
             from simulator_service import SimulatorService
             self.simulator_service = SimulatorService()
             print("[WorkingBuild] Initialized SimulatorService")
-        except:
+        except ImportError:
             self.simulator_service = None
         
         # Import production build system
@@ -39,8 +61,11 @@ class WorkingBuildService:
             from production_build_system import production_build_system
             self.production_build = production_build_system
             print("[WorkingBuild] Initialized ProductionBuildSystem")
-        except:
+        except ImportError:
             self.production_build = None
+        
+        # (device_id, bundle_id) -> bundle signature of the last installed copy
+        self._installed_sig: Dict[tuple, tuple] = {}
     
     async def build_and_launch(self, project_path: str, project_id: str) -> Dict:
         """
@@ -63,7 +88,8 @@ class WorkingBuildService:
             return await direct_build_system.build_and_launch(project_path, project_id)
         except Exception as e:
             print(f"[WorkingBuild] Direct build failed: {e}")
-            # Try emergency fix as fallback
+            # Try emergency fix as fallback; it rewrites the sources, so it
+            # must only run once the direct build has given up on them
             try:
                 from .emergency_fix_build import emergency_build_fix
                 print("[WorkingBuild] Falling back to EMERGENCY FIX")
@@ -167,12 +193,19 @@ class WorkingBuildService:
                         if device.get('state') == 'Booted':
                             device_id = device['udid']
                             
-                            # Install and launch
-                            subprocess.run(
-                                ['xcrun', 'simctl', 'install', device_id, app_path],
-                                capture_output=True,
-                                timeout=30
-                            )
+                            # Install only if the bundle changed since the last install
+                            sig = self._bundle_signature(app_path)
+                            key = (device_id, bundle_id)
+                            if sig is None or self._installed_sig.get(key) != sig:
+                                install = subprocess.run(
+                                    ['xcrun', 'simctl', 'install', device_id, app_path],
+                                    capture_output=True,
+                                    timeout=30
+                                )
+                                if install.returncode == 0 and sig is not None:
+                                    self._installed_sig[key] = sig
+                            else:
+                                print(f"[WorkingBuild] Bundle unchanged, skipping install")
                             
                             subprocess.run(
                                 ['xcrun', 'simctl', 'launch', device_id, bundle_id],
@@ -180,15 +213,27 @@ class WorkingBuildService:
                                 timeout=10
                             )
                             
-                            # Open Simulator
-                            subprocess.run(['open', '-a', 'Simulator'])
+                            # Open Simulator unless it is already up
+                            if not _simulator_app_running():
+                                subprocess.run(['open', '-a', 'Simulator'])
                             
                             return True
-        except:
-            pass
+        except (subprocess.SubprocessError, OSError, json.JSONDecodeError, KeyError) as e:
+            print(f"[WorkingBuild] simctl fallback failed: {e}")
         
         return False
     
+    def _bundle_signature(self, app_path: str) -> Optional[tuple]:
+        """Cheap change signature for an .app bundle (Info.plist mtime + executable size)"""
+        try:
+            executable = os.path.join(app_path, Path(app_path).stem)
+            return (
+                os.stat(os.path.join(app_path, 'Info.plist')).st_mtime_ns,
+                os.stat(executable).st_size
+            )
+        except OSError:
+            return None
+    
     def _get_complexity(self, project_path: str) -> str:
         """Determine app complexity"""
         try:
@@ -202,7 +247,7 @@ class WorkingBuildService:
                 return 'medium'
             else:
                 return 'complex'
-        except:
+        except OSError:
             return 'simple'
     
     def _get_bundle_id(self, project_path: str) -> str:
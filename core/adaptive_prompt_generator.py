@@ -3,54 +3,74 @@ Adaptive Prompt Generator - Dynamic prompts based on complexity analysis
 Generates minimal prompts for simple apps, comprehensive for complex ones
 """
 
-from typing import Dict, List, Optional
+from typing import ClassVar, Dict, List, Optional
 from dataclasses import dataclass
 import json
+import string
 
 from .complexity_analyzer import ComplexityScore
 
+# Bytes to strip when sanitizing app names (everything except [A-Za-z0-9_])
+_NAME_ALLOWED = (string.ascii_letters + string.digits + '_').encode('ascii')
+_NAME_DELETE_BYTES = bytes(b for b in range(256) if b not in _NAME_ALLOWED)
+
 class AdaptivePromptGenerator:
     """Generate prompts that scale with app complexity"""
     
-    def __init__(self):
-        # Base prompt templates for different complexity levels
-        self.base_templates = {
-            'simple': self._get_simple_template(),
-            'medium': self._get_medium_template(),
-            'complex': self._get_complex_template()
-        }
+    # Base prompt templates for different complexity levels (shared by all instances)
+    BASE_TEMPLATES: ClassVar[Dict[str, str]] = {
+        'simple': """Create a simple, functional iOS app.
+Focus on core functionality only.
+No unnecessary complexity.""",
+        
+        'medium': """Create a well-structured iOS app.
+Implement proper architecture.
+Include error handling and state management.""",
         
-        # Feature-specific requirements
-        self.feature_requirements = {
-            'authentication': """
+        'complex': """Create a production-ready iOS app.
+Implement comprehensive architecture.
+Include all professional features and optimizations."""
+    }
+    
+    # Feature-specific requirements
+    FEATURE_REQUIREMENTS: ClassVar[Dict[str, str]] = {
+        'authentication': """
 - Implement secure user authentication
 - Include login/logout functionality
 - Handle authentication state properly
 - Store credentials securely (never in plain text)""",
-            
-            'networking': """
+        
+        'networking': """
 - Implement proper error handling for network requests
 - Use async/await for all network calls
 - Include appropriate loading states
 - Handle offline scenarios gracefully""",
-            
-            'persistence': """
+        
+        'persistence': """
 - Implement data persistence appropriately
 - Use UserDefaults for simple settings
 - Consider Core Data for complex data models
 - Ensure data integrity""",
-            
-            'real-time': """
+        
+        'real-time': """
 - Implement real-time updates efficiently
 - Use appropriate update intervals
 - Handle connection state changes
 - Minimize battery impact""",
-            
-            'animations': """
+        
+        'animations': """
 - Use smooth, natural animations
 - Follow Apple's animation guidelines
 - Ensure animations are performant
 - Provide reduced motion alternatives"""
+    }
+    
+    def __init__(self):
+        # Staged generation dispatch
+        self._stage_handlers = {
+            'core': self._get_core_stage_prompt,
+            'features': self._get_features_stage_prompt,
+            'polish': self._get_polish_stage_prompt
         }
     
     def generate(self, 
@@ -156,13 +176,13 @@ FEATURES TO IMPLEMENT:
         
         # Add specific requirements based on complexity analysis
         if complexity.has_authentication:
-            prompt += self.feature_requirements['authentication']
+            prompt += self.FEATURE_REQUIREMENTS['authentication']
         
         if complexity.has_networking:
-            prompt += self.feature_requirements['networking']
+            prompt += self.FEATURE_REQUIREMENTS['networking']
         
         if complexity.has_persistence:
-            prompt += self.feature_requirements['persistence']
+            prompt += self.FEATURE_REQUIREMENTS['persistence']
         
         prompt += """
 
@@ -231,23 +251,23 @@ DETECTED FEATURES TO IMPLEMENT:
         # Add all relevant feature requirements
         if complexity.has_authentication:
             prompt += "\nAUTHENTICATION REQUIREMENTS:"
-            prompt += self.feature_requirements['authentication']
+            prompt += self.FEATURE_REQUIREMENTS['authentication']
         
         if complexity.has_networking:
             prompt += "\nNETWORKING REQUIREMENTS:"
-            prompt += self.feature_requirements['networking']
+            prompt += self.FEATURE_REQUIREMENTS['networking']
         
         if complexity.has_persistence:
             prompt += "\nDATA PERSISTENCE:"
-            prompt += self.feature_requirements['persistence']
+            prompt += self.FEATURE_REQUIREMENTS['persistence']
         
         if complexity.has_real_time:
             prompt += "\nREAL-TIME FEATURES:"
-            prompt += self.feature_requirements['real-time']
+            prompt += self.FEATURE_REQUIREMENTS['real-time']
         
         if complexity.has_animations:
             prompt += "\nANIMATION REQUIREMENTS:"
-            prompt += self.feature_requirements['animations']
+            prompt += self.FEATURE_REQUIREMENTS['animations']
         
         # Add technical requirements if detected
         if complexity.technical_requirements:
@@ -390,15 +410,10 @@ Remember: Modify only what's necessary, preserve everything else."""
     
     def get_stage_prompt(self, stage: str, context: Dict, complexity: ComplexityScore) -> str:
         """Generate prompts for staged generation"""
-        
-        if stage == "core":
-            return self._get_core_stage_prompt(context, complexity)
-        elif stage == "features":
-            return self._get_features_stage_prompt(context, complexity)
-        elif stage == "polish":
-            return self._get_polish_stage_prompt(context, complexity)
-        else:
+        handler = self._stage_handlers.get(stage)
+        if handler is None:
             return ""
+        return handler(context, complexity)
     
     def _get_core_stage_prompt(self, context: Dict, complexity: ComplexityScore) -> str:
         """Generate prompt for core structure generation"""
@@ -424,10 +439,17 @@ Return complete, valid Swift code."""
         feature = context.get('current_feature', 'unknown')
         existing_code = context.get('existing_code', '')
         
+        # Slice the head once per existing_code and reuse it across feature calls
+        cached = context.get('_existing_code_head')
+        if cached is None or cached[0] is not existing_code:
+            cached = (existing_code, existing_code[:1000])
+            context['_existing_code_head'] = cached
+        code_head = cached[1]
+        
         return f"""Add the {feature} feature to the existing code.
 
 Current code structure:
-{existing_code[:1000]}...
+{code_head}...
 
 Integrate {feature} by:
 1. Adding necessary models
@@ -451,8 +473,8 @@ Return improved versions of files that need enhancement."""
     
     def _sanitize_name(self, name: str) -> str:
         """Sanitize app name for use as identifier"""
-        # Remove special characters and spaces
-        safe = ''.join(c for c in name if c.isalnum() or c == '_')
+        # Remove special characters and spaces (single C-level pass)
+        safe = name.encode('ascii', 'ignore').translate(None, _NAME_DELETE_BYTES).decode('ascii')
         # Ensure it starts with a letter
         if safe and not safe[0].isalpha():
             safe = 'App' + safe
@@ -460,19 +482,12 @@ Return improved versions of files that need enhancement."""
     
     def _get_simple_template(self) -> str:
         """Base template for simple apps"""
-        return """Create a simple, functional iOS app.
-Focus on core functionality only.
-No unnecessary complexity."""
+        return self.BASE_TEMPLATES['simple']
     
     def _get_medium_template(self) -> str:
         """Base template for medium apps"""
-        return """Create a well-structured iOS app.
-Implement proper architecture.
-Include error handling and state management."""
+        return self.BASE_TEMPLATES['medium']
     
     def _get_complex_template(self) -> str:
         """Base template for complex apps"""
-        return """Create a production-ready iOS app.
-Implement comprehensive architecture.
-Include all professional features and optimizations."""
-
+        return self.BASE_TEMPLATES['complex']
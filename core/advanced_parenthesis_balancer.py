@@ -1,10 +1,164 @@
 """
 Advanced Parenthesis Balancer - Intelligently fixes missing parentheses in Swift code
 Uses context-aware parsing to fix function calls with missing closing parentheses
+
+Fully type-annotated so it can be compiled with mypyc (`mypyc core/advanced_parenthesis_balancer.py`)
+without source changes; the pure-Python module remains the default
 """
 
+import bisect
+import functools
+import logging
+import os
 import re
-from typing import List, Tuple, Optional
+import shutil
+import tempfile
+from collections import deque
+from typing import Deque, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Patterns used by fix_code, compiled once at import
+_FUNC_CALL_BRACE_RE = re.compile(r'(\w+)\s*\([^)]*\s*\{')
+_MALFORMED_BUTTON_RE = re.compile(r'Button\(action:\)\s*\{')
+_TERNARY_CLOSURE_RE = re.compile(r'(\w+:\s*\w+\s*\?\s*\.\w+\s*:\s*\.\w+)\s*\{')
+# Union of patterns 1, 1b and 3: a single search per line tells whether any
+# of them can apply; the individual patterns only run on the rare hit
+_DISPATCH_RE = re.compile(
+    r'(?P<malformed_button>Button\(action:\)\s*\{)'
+    r'|(?P<ternary>\w+:\s*\w+\s*\?\s*\.\w+\s*:\s*\.\w+\s*\{)'
+    r'|(?P<func_brace>\w+\s*\([^)]*\s*\{)'
+)
+_FUNC_OPEN_RE = re.compile(r'\s*(\w+)\s*\($')
+# Line ending in a parameter value: `: .member`, `: ident` or `: "string"`
+_PARAM_TAIL_RE = re.compile(r':\s*(?:\.\w+|\w+|"[^"]+")\s*$')
+
+# Max lines Pattern 2 treats as part of one multi-line call before giving up
+_MAX_LOOKAHEAD = 200
+
+# Lexical states for _scan_delims
+_CODE, _STRING, _MULTILINE_STRING, _LINE_COMMENT, _BLOCK_COMMENT = range(5)
+
+# Next token of interest in each state; everything in between is skipped in C.
+# The scan runs over UTF-8 bytes (multi-byte sequences never contain ASCII).
+# (a stray \" in code, common in mis-escaped LLM output, is not a string start)
+_NONCODE_TOKEN_RE = re.compile(rb'\\"|"""|"|//|/\*')
+_STRING_TOKEN_RE = re.compile(rb'\\.|"|\n')
+_MULTILINE_STRING_TOKEN_RE = re.compile(rb'\\.|"""', re.DOTALL)
+
+# bytes.translate deletion set: drop every byte except ()[]{}, so a whole
+# code span is classified in one C call and Python only sees delimiters
+_NON_DELIM_BYTES = bytes(b for b in range(256) if b not in b'(){}[]')
+_DELIM_RE = re.compile(rb'[(){}\[\]]')
+_DELIM_CHARS = {ord(c): c for c in '(){}[]'}
+_NEWLINE_RE = re.compile(rb'\n')
+
+
+def _code_spans(data: bytes) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (start, stop) byte ranges of Swift code, skipping string literals
+    and comments. A single left-to-right pass over a tiny state machine;
+    regexes jump straight to the next token for the current state.
+    """
+    state: int = _CODE
+    pos: int = 0
+    end: int = len(data)
+    # Local for the hot path (LOAD_FAST instead of global + attribute lookup)
+    noncode_search = _NONCODE_TOKEN_RE.search
+    
+    while pos < end:
+        if state == _CODE:
+            m = noncode_search(data, pos)
+            if not m:
+                yield pos, end
+                return
+            token = m.group()
+            if token == b'\\"':
+                yield pos, m.end()
+            elif token == b'"':
+                yield pos, m.start()
+                state = _STRING
+            elif token == b'"""':
+                yield pos, m.start()
+                state = _MULTILINE_STRING
+            elif token == b'//':
+                yield pos, m.start()
+                state = _LINE_COMMENT
+            else:
+                yield pos, m.start()
+                state = _BLOCK_COMMENT
+            pos = m.end()
+        elif state == _STRING:
+            m = _STRING_TOKEN_RE.search(data, pos)
+            if not m:
+                return
+            pos = m.end()
+            # Single-line strings end at the closing quote, or at end of line
+            # if unterminated so one stray quote can't swallow the file
+            if m.group() in (b'"', b'\n'):
+                state = _CODE
+        elif state == _MULTILINE_STRING:
+            m = _MULTILINE_STRING_TOKEN_RE.search(data, pos)
+            if not m:
+                return
+            pos = m.end()
+            if m.group() == b'"""':
+                state = _CODE
+        elif state == _LINE_COMMENT:
+            pos = data.find(b'\n', pos)
+            if pos == -1:
+                return
+            state = _CODE
+        else:
+            pos = data.find(b'*/', pos)
+            if pos == -1:
+                return
+            pos += 2
+            state = _CODE
+
+
+def _delims_balanced(data: bytes) -> bool:
+    """Position-free check that every ()[]{} in code is matched"""
+    parens = braces = brackets = 0
+    for start, stop in _code_spans(data):
+        for b in data[start:stop].translate(None, _NON_DELIM_BYTES):
+            if b == 40:      # (
+                parens += 1
+            elif b == 41:    # )
+                parens -= 1
+                if parens < 0:
+                    return False
+            elif b == 123:   # {
+                braces += 1
+            elif b == 125:   # }
+                braces -= 1
+                if braces < 0:
+                    return False
+            elif b == 91:    # [
+                brackets += 1
+            else:            # ]
+                brackets -= 1
+                if brackets < 0:
+                    return False
+    return parens == braces == brackets == 0
+
+
+def _scan_delims(data: bytes) -> Iterator[Tuple[int, str]]:
+    """Yield (byte_offset, char) for every ()[]{} in code (outside strings/comments)"""
+    delim_chars = _DELIM_CHARS
+    for start, stop in _code_spans(data):
+        for m in _DELIM_RE.finditer(data, start, stop):
+            yield m.start(), delim_chars[data[m.start()]]
+
+
+def _iter_split_lines(f: TextIO) -> Iterator[str]:
+    """Yield lines of a text file without newlines, matching str.split('\\n')"""
+    line = ''
+    for line in f:
+        yield line[:-1] if line.endswith('\n') else line
+    if not line or line.endswith('\n'):
+        yield ''
+
 
 class AdvancedParenthesisBalancer:
     """
@@ -13,191 +167,242 @@ class AdvancedParenthesisBalancer:
     """
     
     @staticmethod
+    @functools.lru_cache(maxsize=128)
     def fix_code(content: str) -> Tuple[str, int]:
         """
         Fix missing parentheses in Swift code
+        Results are memoized per content (bounded LRU) since repair loops
+        often resubmit identical files
         Returns: (fixed_content, number_of_fixes)
         """
-        lines = content.split('\n')
-        fixes_applied = 0
-        fixed_lines = []
+        counter = [0]
+        fixed_content = '\n'.join(AdvancedParenthesisBalancer.fix_lines(content.split('\n'), counter))
+        return fixed_content, counter[0]
+    
+    @staticmethod
+    def fix_lines(lines: Iterable[str], counter: Optional[List[int]] = None) -> Iterator[str]:
+        """
+        Fix missing parentheses line by line (lines without trailing newlines)
+        Yields fixed lines; the number of fixes is added to counter[0]
+        Only a small look-behind window and the current multi-line call are buffered
+        """
+        if counter is None:
+            counter = [0]
+        line_iter = iter(lines)
+        # Raw (unfixed) recent lines for the Pattern 1c look-behind
+        history: Deque[str] = deque(maxlen=5)
+        remember = history.append
+        # Locals for the per-line hot path
+        dispatch_search = _DISPATCH_RE.search
+        func_open_match = _FUNC_OPEN_RE.match
         
-        i = 0
-        while i < len(lines):
-            line = lines[i]
+        i: int = 0
+        for line in line_iter:
+            stripped = line.strip()
+            # Every pattern needs '{' plus '(' (patterns 1/1b) or '?' (pattern 3);
+            # these C-level substring tests reject most lines before any regex
+            candidate = '{' in line and ('(' in line or '?' in line) and \
+                dispatch_search(line) is not None
             
             # Pattern 1: Function call with parameters ending with a closure
             # Example: TimerButton(title: "x", color: .red { // Missing )
-            if '(' in line and '{' in line and ')' not in line[line.index('('):line.index('{')]:
-                # Check if this looks like a function call
-                func_pattern = r'(\w+)\s*\([^)]*\s*\{'
-                if re.search(func_pattern, line):
-                    # Find where to insert the closing paren
-                    brace_pos = line.index('{')
+            if candidate:
+                # One find per delimiter ('{' is guaranteed present by candidate)
+                lp = line.find('(')
+                brace_pos = line.find('{')
+                if lp >= 0 and line.find(')', lp, brace_pos) == -1 and _FUNC_CALL_BRACE_RE.search(line):
                     # Insert ) before {
-                    fixed_line = line[:brace_pos].rstrip() + ')' + line[brace_pos:]
-                    fixed_lines.append(fixed_line)
-                    fixes_applied += 1
-                    print(f"[Parenthesis Balancer] Fixed missing ) before {{ on line {i+1}")
+                    yield line[:brace_pos].rstrip() + ')' + line[brace_pos:]
+                    counter[0] += 1
+                    logger.debug("[Parenthesis Balancer] Fixed missing ) before { on line %d", i + 1)
+                    remember(line)
                     i += 1
                     continue
             
             # Pattern 1b: Malformed Button(action:){ pattern
             # Should be Button(action: {
-            malformed_button = r'Button\(action:\)\s*\{'
-            if re.search(malformed_button, line):
-                fixed_line = re.sub(r'Button\(action:\)\s*\{', 'Button(action: {', line)
-                fixed_lines.append(fixed_line)
-                fixes_applied += 1
-                print(f"[Parenthesis Balancer] Fixed malformed Button(action:) on line {i+1}")
+            if candidate and 'Button(action:)' in line and _MALFORMED_BUTTON_RE.search(line):
+                yield _MALFORMED_BUTTON_RE.sub('Button(action: {', line)
+                counter[0] += 1
+                logger.debug("[Parenthesis Balancer] Fixed malformed Button(action:) on line %d", i + 1)
+                remember(line)
                 i += 1
                 continue
             
             # Pattern 1c: Extra }) that should just be }
             # Common when LLMs generate malformed button closures
-            if line.strip() == '})' and i > 0:
+            if stripped == '})' and i > 0:
                 # Check if previous lines indicate this is a closure ending
-                prev_lines = '\n'.join(lines[max(0, i-5):i])
-                if 'Button(action:' in prev_lines or 'Button {' in prev_lines:
+                if any('Button(action:' in prev or 'Button {' in prev for prev in history):
                     # This is likely an extra paren
-                    fixed_lines.append(line.replace('})', '}'))
-                    fixes_applied += 1
-                    print(f"[Parenthesis Balancer] Removed extra ) from }} on line {i+1}")
+                    yield line.replace('})', '}')
+                    counter[0] += 1
+                    logger.debug("[Parenthesis Balancer] Removed extra ) from } on line %d", i + 1)
+                    remember(line)
                     i += 1
                     continue
             
             # Pattern 2: Multi-line function call with missing closing paren
             # Detect function calls that span multiple lines
-            if re.match(r'\s*\w+\s*\($', line.strip()):
+            func_open = func_open_match(stripped) if stripped.endswith('(') else None
+            if func_open:
                 # This is a function call opening
-                func_name = re.match(r'\s*(\w+)\s*\($', line.strip()).group(1)
-                open_parens = 1
-                close_parens = 0
-                func_lines = [line]
+                func_name = func_open.group(1)
+                # Net open parens of the call so far
+                depth: int = 1
+                # Only the previous line can still receive a ), so hold just
+                # that one back and emit everything before it immediately
+                pending = line
+                remember(line)
                 j = i + 1
                 
-                # Scan ahead to find the matching structure
-                while j < len(lines) and open_parens > close_parens:
-                    next_line = lines[j]
-                    func_lines.append(next_line)
+                # Scan ahead to find the matching structure; bounded so an
+                # unclosed call can't swallow the rest of the file
+                scan_end = j + _MAX_LOOKAHEAD
+                while depth > 0 and j < scan_end:
+                    next_line = next(line_iter, None)
+                    if next_line is None:
+                        break
+                    remember(next_line)
                     
                     # Count parentheses
-                    open_parens += next_line.count('(')
-                    close_parens += next_line.count(')')
+                    depth += next_line.count('(') - next_line.count(')')
                     
                     # Check if we hit a closure opening without closing the function
-                    if '{' in next_line and open_parens > close_parens:
+                    if depth > 0 and '{' in next_line:
                         # Check if the previous line might be missing a )
                         if j > i + 1:
-                            prev_line = func_lines[-2]
                             # If previous line ends with a parameter, add )
-                            if re.search(r':\s*\.\w+\s*$', prev_line) or \
-                               re.search(r':\s*\w+\s*$', prev_line) or \
-                               re.search(r':\s*"[^"]+"\s*$', prev_line):
+                            if _PARAM_TAIL_RE.search(pending):
                                 # Add closing paren to previous line
-                                func_lines[-2] = prev_line.rstrip() + ')'
-                                fixes_applied += 1
-                                close_parens += 1
-                                print(f"[Parenthesis Balancer] Added missing ) on line {i+j}")
+                                pending = pending.rstrip() + ')'
+                                counter[0] += 1
+                                depth -= 1
+                                logger.debug("[Parenthesis Balancer] Added missing ) on line %d", i + j)
                         # Or if current line starts with {
                         elif next_line.strip().startswith('{'):
                             # Insert ) at the end of previous line
-                            func_lines[-2] = func_lines[-2].rstrip() + ')'
-                            fixes_applied += 1
-                            close_parens += 1
-                            print(f"[Parenthesis Balancer] Added ) before {{ on line {i+j}")
+                            pending = pending.rstrip() + ')'
+                            counter[0] += 1
+                            depth -= 1
+                            logger.debug("[Parenthesis Balancer] Added ) before { on line %d", i + j)
+                    
+                    yield pending
+                    pending = next_line
                     j += 1
                 
-                # Add all the processed lines
-                fixed_lines.extend(func_lines)
+                yield pending
                 i = j
                 continue
             
             # Pattern 3: Ternary operator followed by closure without closing paren
             # Example: color: isRunning ? .red : .green {
-            ternary_pattern = r'(\w+:\s*\w+\s*\?\s*\.\w+\s*:\s*\.\w+)\s*\{'
-            match = re.search(ternary_pattern, line)
-            if match:
+            if candidate and '?' in line and _TERNARY_CLOSURE_RE.search(line):
                 # Insert ) before {
-                fixed_line = re.sub(ternary_pattern, r'\1) {', line)
-                fixed_lines.append(fixed_line)
-                fixes_applied += 1
-                print(f"[Parenthesis Balancer] Fixed ternary+closure on line {i+1}")
+                yield _TERNARY_CLOSURE_RE.sub(r'\1) {', line)
+                counter[0] += 1
+                logger.debug("[Parenthesis Balancer] Fixed ternary+closure on line %d", i + 1)
+                remember(line)
                 i += 1
                 continue
             
             # No fixes needed for this line
-            fixed_lines.append(line)
+            yield line
+            remember(line)
             i += 1
-        
-        return '\n'.join(fixed_lines), fixes_applied
     
     @staticmethod
     def balance_file(file_path: str) -> bool:
         """
         Balance parentheses in a Swift file
+        Streams the file through fix_lines into a temp file, replacing the
+        original only if fixes were applied
         Returns True if fixes were applied
         """
+        tmp_path = None
         try:
-            with open(file_path, 'r') as f:
-                content = f.read()
-            
-            fixed_content, fixes = AdvancedParenthesisBalancer.fix_code(content)
+            counter = [0]
+            with open(file_path, 'r') as src:
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(file_path)),
+                                                suffix='.swift.tmp')
+                with os.fdopen(fd, 'w') as dst:
+                    first = True
+                    for fixed_line in AdvancedParenthesisBalancer.fix_lines(_iter_split_lines(src), counter):
+                        if not first:
+                            dst.write('\n')
+                        dst.write(fixed_line)
+                        first = False
             
+            fixes = counter[0]
             if fixes > 0:
-                with open(file_path, 'w') as f:
-                    f.write(fixed_content)
-                print(f"[Parenthesis Balancer] Applied {fixes} fixes to {file_path}")
+                shutil.copymode(file_path, tmp_path)
+                os.replace(tmp_path, file_path)
+                tmp_path = None
+                logger.info("[Parenthesis Balancer] Applied %d fixes to %s", fixes, file_path)
                 return True
             
             return False
         except Exception as e:
-            print(f"[Parenthesis Balancer] Error processing {file_path}: {e}")
+            logger.error("[Parenthesis Balancer] Error processing %s: %s", file_path, e)
             return False
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
     
     @staticmethod
     def validate_balance(content: str) -> List[str]:
         """
         Validate if parentheses are balanced and return issues
+        Delimiters inside string literals and comments are ignored
         """
-        issues = []
-        lines = content.split('\n')
+        data = content.encode('utf-8', 'surrogatepass')
+        
+        # Common case: nothing to report, so no positions are ever needed
+        if _delims_balanced(data):
+            return []
+        
+        # Newline offsets computed once; offsets map to lines only when reported
+        newlines = [m.start() for m in _NEWLINE_RE.finditer(data)]
+        
+        def line_of(offset: int) -> int:
+            return bisect.bisect_right(newlines, offset) + 1
+        
+        issues: List[str] = []
         
-        # Track overall balance
-        paren_stack = []
-        brace_stack = []
-        bracket_stack = []
+        # Track overall balance (byte offsets of unmatched openers)
+        paren_stack: List[int] = []
+        brace_stack: List[int] = []
+        bracket_stack: List[int] = []
         
-        for i, line in enumerate(lines, 1):
-            for char in line:
-                if char == '(':
-                    paren_stack.append(i)
-                elif char == ')':
-                    if not paren_stack:
-                        issues.append(f"Line {i}: Unmatched closing parenthesis")
-                    else:
-                        paren_stack.pop()
-                elif char == '{':
-                    brace_stack.append(i)
-                elif char == '}':
-                    if not brace_stack:
-                        issues.append(f"Line {i}: Unmatched closing brace")
-                    else:
-                        brace_stack.pop()
-                elif char == '[':
-                    bracket_stack.append(i)
-                elif char == ']':
-                    if not bracket_stack:
-                        issues.append(f"Line {i}: Unmatched closing bracket")
-                    else:
-                        bracket_stack.pop()
+        for offset, char in _scan_delims(data):
+            if char == '(':
+                paren_stack.append(offset)
+            elif char == ')':
+                if not paren_stack:
+                    issues.append(f"Line {line_of(offset)}: Unmatched closing parenthesis")
+                else:
+                    paren_stack.pop()
+            elif char == '{':
+                brace_stack.append(offset)
+            elif char == '}':
+                if not brace_stack:
+                    issues.append(f"Line {line_of(offset)}: Unmatched closing brace")
+                else:
+                    brace_stack.pop()
+            elif char == '[':
+                bracket_stack.append(offset)
+            elif char == ']':
+                if not bracket_stack:
+                    issues.append(f"Line {line_of(offset)}: Unmatched closing bracket")
+                else:
+                    bracket_stack.pop()
         
         # Report unclosed delimiters
         if paren_stack:
-            issues.append(f"Unclosed parentheses starting at lines: {paren_stack[:5]}")
+            issues.append(f"Unclosed parentheses starting at lines: {[line_of(o) for o in paren_stack[:5]]}")
         if brace_stack:
-            issues.append(f"Unclosed braces starting at lines: {brace_stack[:5]}")
+            issues.append(f"Unclosed braces starting at lines: {[line_of(o) for o in brace_stack[:5]]}")
         if bracket_stack:
-            issues.append(f"Unclosed brackets starting at lines: {bracket_stack[:5]}")
+            issues.append(f"Unclosed brackets starting at lines: {[line_of(o) for o in bracket_stack[:5]]}")
         
-        return issues
\ No newline at end of file
+        return issues
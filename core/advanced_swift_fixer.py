@@ -5,17 +5,161 @@ Properly fixes structural issues, scope problems, and complex features
 
 import re
 import json
-from typing import Dict, List, Tuple, Optional, Any
+import array
+import bisect
+import functools
+from typing import Callable, Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 
+# Scope analyzer is optional; resolved once at import instead of per call
+try:
+    from core.scope_analyzer import fix_swift_scope_issues as _scope_fix
+except ImportError:
+    _scope_fix = None  # type: ignore[assignment]
+
+# Patterns compiled once at import
+_FOREACH_RE = re.compile(r'ForEach\([^)]+\)\s*\{\s*(\w+)\s+in')
+_VAR_REF_RE = re.compile(r'\b(item|row|element)\b')
+_SHEET_ISPRESENTED_RE = re.compile(r'\.sheet\(isPresented:\s+([a-zA-Z_]\w*)\)')
+_SHEET_ITEM_RE = re.compile(r'\.sheet\(item:\s+([a-zA-Z_]\w*)\)')
+_NAVLINK_ISACTIVE_RE = re.compile(r'NavigationLink\(isActive:\s+([a-zA-Z_]\w*)\)')
+_FUNC_RETURNING_HEADER_RE = re.compile(r'(func\s+\w+\([^)]*\))\s*(->\s*[^{]+)\s*\{')
+_CLASS_DECL_RE = re.compile(r'class\s+(\w+)\s*(?!.*:\s*ObservableObject)')
+_OBSERVED_VAR_RE = re.compile(r'@ObservedObject\s+(?:private\s+)?var\s+(\w+)')
+_ASSIGNED_NAME_RE = re.compile(r'\b(\w+) = ')
+# Tokens for the scope-chain state machine; strings and comments are matched
+# so their contents can be skipped
+_SCOPE_TOKEN_RE = re.compile(r'"(?:\\.|[^"\\\n])*"|//[^\n]*|/\*.*?\*/|->|[A-Za-z_]\w*|[{}()]', re.DOTALL)
+
+# Fix descriptions reported in fixes_applied
+_FIX_SWIPEACTIONS = "Fixed nested ForEach with swipeActions scope issue"
+_FIX_SHEET_BINDING = "Fixed sheet/navigation binding issues"
+_FIX_NAVIGATION_STACK = "Updated NavigationView to NavigationStack for iOS 16+"
+_FIX_ASYNC_TASK = "Wrapped async calls in Task blocks"
+_FIX_STATE_OBJECT = "Fixed @ObservedObject vs @StateObject usage"
+_FIX_VIEW_BUILDER = "Added warning for excessive ViewBuilder children"
+
+def _add_async_to_await_funcs(content: str) -> str:
+    """
+    Mark `func name(...) -> Type { ... await ... }` as async when the body up
+    to its first '}' contains await. Linear replacement for a single regex
+    whose [^}]*await[^}]* body backtracked quadratically on long bodies.
+    """
+    parts = []
+    last = pos = 0
+    search = _FUNC_RETURNING_HEADER_RE.search
+    match = search(content, pos)
+    while match:
+        body_start = match.end()
+        body_end = content.find('}', body_start)
+        if body_end != -1 and 'await' in content[body_start:body_end]:
+            parts.append(content[last:match.start()])
+            parts.append(f"{match.group(1)} async {match.group(2)} {{{content[body_start:body_end]}}}")
+            last = pos = body_end + 1
+        else:
+            # Retry from the next position, as re.sub would
+            pos = match.start() + 1
+        match = search(content, pos)
+    
+    if not parts:
+        return content
+    parts.append(content[last:])
+    return ''.join(parts)
+
+def _find_balanced(s: str, start: int, opener: str = '{', closer: str = '}') -> int:
+    """Index of the closer matching the opener at s[start], or -1 if unbalanced"""
+    depth = 0
+    for i in range(start, len(s)):
+        char = s[i]
+        if char == opener:
+            depth += 1
+        elif char == closer:
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+def _skip_whitespace(s: str, pos: int) -> int:
+    """Index of the first non-whitespace character at or after pos"""
+    while pos < len(s) and s[pos].isspace():
+        pos += 1
+    return pos
+
+def _restructure_foreach_swipeactions(content: str) -> str:
+    """
+    Rewrite `ForEach(items.filter...) { item in BODY } .swipeActions { ACTIONS }`
+    so the swipeActions attach to the row inside the ForEach. Located with
+    literal finds and brace matching, so it runs in linear time and handles
+    filter closures. Returns content itself when nothing was rewritten.
+    """
+    parts = []
+    last = pos = 0
+    while True:
+        start = content.find('ForEach(items.filter', pos)
+        if start == -1:
+            break
+        pos = start + 1
+        
+        # ForEach(...) { item in
+        args_end = _find_balanced(content, start + 7, '(', ')')
+        if args_end == -1:
+            continue
+        body_open = _skip_whitespace(content, args_end + 1)
+        if not content.startswith('{', body_open):
+            continue
+        binding = _skip_whitespace(content, body_open + 1)
+        if not content.startswith('item', binding):
+            continue
+        keyword = _skip_whitespace(content, binding + 4)
+        if keyword == binding + 4 or not content.startswith('in', keyword):
+            continue
+        body_start = _skip_whitespace(content, keyword + 2)
+        if body_start == keyword + 2:
+            continue
+        body_close = _find_balanced(content, body_open)
+        if body_close <= body_start:
+            continue
+        
+        # } .swipeActions { ... }
+        modifier = _skip_whitespace(content, body_close + 1)
+        if not content.startswith('.swipeActions', modifier):
+            continue
+        actions_open = _skip_whitespace(content, modifier + 13)
+        if not content.startswith('{', actions_open):
+            continue
+        actions_close = _find_balanced(content, actions_open)
+        if actions_close <= actions_open + 1:
+            continue
+        
+        foreach_start = content[start:body_start]
+        foreach_body = content[body_start:body_close]
+        swipeactions_body = content[actions_open + 1:actions_close]
+        
+        # Rebuild with swipeActions attached to the row/view inside ForEach
+        parts.append(content[last:start])
+        if 'ReminderRow' in foreach_body or 'Row' in foreach_body:
+            # Attach swipeActions to the Row
+            foreach_body = foreach_body.rstrip()
+            parts.append(f"{foreach_start}{foreach_body}\n                            .swipeActions {{{swipeactions_body}}}\n                        }}")
+        else:
+            # Create a proper structure
+            parts.append(f"{foreach_start}HStack {{ {foreach_body} }}\n                            .swipeActions {{{swipeactions_body}}}\n                        }}")
+        last = pos = actions_close + 1
+    
+    if not parts:
+        return content
+    parts.append(content[last:])
+    return ''.join(parts)
+
 class SwiftScope:
     """Represents a scope in Swift code"""
-    def __init__(self, scope_type: str, variables: List[str], parent=None):
+    def __init__(self, scope_type: str, variables: List[str], parent: Optional['SwiftScope'] = None):
         self.scope_type = scope_type  # 'ForEach', 'function', 'struct', etc.
         self.variables = variables    # Variables available in this scope
         self.parent = parent          # Parent scope
-        self.children = []           # Child scopes
+        self.depth: int = parent.depth + 1 if parent else 0  # Nesting depth, root is 0
+        self.children: List['SwiftScope'] = []  # Child scopes
         
     def has_variable(self, var_name: str) -> bool:
         """Check if variable is available in this scope or parent scopes"""
@@ -30,10 +174,10 @@ class AdvancedSwiftFixer:
     Advanced fixer that properly handles complex Swift/SwiftUI patterns
     """
     
-    def __init__(self):
+    def __init__(self) -> None:
         self.complex_patterns = self._init_complex_patterns()
         
-    def _init_complex_patterns(self):
+    def _init_complex_patterns(self) -> Dict[str, Callable[[str, str], Tuple[str, Optional[str]]]]:
         """Initialize patterns for complex Swift features"""
         return {
             'nested_foreach_swipeactions': self._fix_nested_foreach_swipeactions,
@@ -50,29 +194,41 @@ class AdvancedSwiftFixer:
         ONLY fixes if there are actual errors, not proactive changes
         Returns: (fixed_content, list_of_fixes_applied)
         """
-        fixes_applied = []
+        fixes_applied: List[str] = []
+        
+        # Evaluate each trigger once up front
+        eo = error_output
+        has_scope_error = 'cannot find' in eo and 'in scope' in eo and '.swipeActions' in content
+        has_binding_error = 'Binding<' in eo and ('cannot convert' in eo or 'expected argument type' in eo)
+        has_async_error = ('async' in eo and 'does not support concurrency' in eo) or \
+                          ('await' in eo and 'not marked with' in eo)
+        has_observable_error = 'ObservableObject' in eo or 'ObservedObject' in eo
+        
+        # Plain substring tests are the multi-pattern prefilter here; nothing
+        # fired means no fixer can apply, so skip the dispatch entirely
+        if not (has_scope_error or has_binding_error or has_async_error or has_observable_error):
+            return content, fixes_applied
         
         # Only fix if there's an actual scope error with swipeActions
-        if 'cannot find' in error_output and 'in scope' in error_output and '.swipeActions' in content:
+        if has_scope_error:
             content, fix = self._fix_nested_foreach_swipeactions(content, error_output)
             if fix:
                 fixes_applied.append(fix)
         
         # Only fix if there's an actual binding error
-        if 'Binding<' in error_output and ('cannot convert' in error_output or 'expected argument type' in error_output):
+        if has_binding_error:
             content, fix = self._fix_sheet_binding_issues(content, error_output)
             if fix:
                 fixes_applied.append(fix)
         
         # Only fix if there's an actual async/await error
-        if ('async' in error_output and 'does not support concurrency' in error_output) or \
-           ('await' in error_output and 'not marked with' in error_output):
+        if has_async_error:
             content, fix = self._fix_async_await_context(content, error_output)
             if fix:
                 fixes_applied.append(fix)
         
         # Only fix if there's an actual ObservableObject error
-        if 'ObservableObject' in error_output or 'ObservedObject' in error_output:
+        if has_observable_error:
             content, fix = self._fix_observable_object_issues(content, error_output)
             if fix:
                 fixes_applied.append(fix)
@@ -88,130 +244,112 @@ class AdvancedSwiftFixer:
         """
         
         # Use the scope analyzer for intelligent fixing
-        try:
-            from core.scope_analyzer import fix_swift_scope_issues
-            
-            # First try the scope analyzer
-            fixed_content, fixes = fix_swift_scope_issues(content)
+        if _scope_fix is not None:
+            fixed_content, fixes = _scope_fix(content)
             if fixes:
                 return fixed_content, f"Fixed scope issues: {', '.join(fixes)}"
-        except ImportError:
-            pass  # Fall back to manual fixing
+        # Otherwise fall back to manual fixing
         
         # Parse the structure to understand the nesting
-        lines = content.split('\n')
+        lines = content.splitlines(keepends=True)
         fixed_lines = []
         
-        # Track ForEach scopes
-        foreach_stack = []  # Stack of (indent_level, variable_name)
-        swipeactions_block = []
-        capturing_swipeactions = False
-        swipeactions_indent = 0
+        # Track ForEach scopes as parallel stacks of indent and variable name,
+        # plus a count per name so scope membership needs no stack walk
+        stack_indents = array.array('i')
+        stack_vars: List[str] = []
+        var_counts: Dict[str, int] = {}
+        
+        # Variable references per line, scanned at most once even when
+        # consecutive swipeActions lookahead windows overlap
+        var_refs: List[Optional[List[str]]] = [None] * len(lines)
         
         for i, line in enumerate(lines):
-            indent = len(line) - len(line.lstrip())
+            # Indent and brace tests are only needed on the few lines that
+            # open a ForEach, start a swipeActions or are a lone '}', so they
+            # are computed in those branches rather than for every line
+            is_closing_brace = '}' in line and line.strip() == '}'
             
             # Detect ForEach and track its variable
-            foreach_match = re.search(r'ForEach\([^)]+\)\s*\{\s*(\w+)\s+in', line)
+            foreach_match = _FOREACH_RE.search(line) if 'ForEach(' in line else None
             if foreach_match:
                 var_name = foreach_match.group(1)
-                foreach_stack.append((indent, var_name))
+                stack_indents.append(len(line) - len(line.lstrip()))
+                stack_vars.append(var_name)
+                var_counts[var_name] = var_counts.get(var_name, 0) + 1
                 fixed_lines.append(line)
                 continue
             
             # Detect swipeActions that references a variable
             if '.swipeActions' in line:
                 # Check if the next few lines reference a variable that's out of scope
-                swipeactions_indent = indent
-                capturing_swipeactions = True
-                swipeactions_block = [line]
+                swipeactions_indent = len(line) - len(line.lstrip())
                 
                 # Look ahead to see what variables are referenced
-                referenced_vars = []
+                referenced_vars = set()
                 for j in range(i+1, min(i+10, len(lines))):
-                    if 'item' in lines[j] or any(var[1] in lines[j] for var in foreach_stack):
-                        # Extract variable references
-                        var_matches = re.findall(r'\b(item|row|element)\b', lines[j])
-                        referenced_vars.extend(var_matches)
+                    next_line = lines[j]
+                    var_matches = var_refs[j]
+                    if var_matches is None:
+                        var_matches = var_refs[j] = _VAR_REF_RE.findall(next_line)
+                    if not var_matches:
+                        continue
+                    if 'item' in next_line or any(var in next_line for var in var_counts):
+                        referenced_vars.update(var_matches)
                 
                 # Determine correct placement
-                if referenced_vars and foreach_stack:
+                if referenced_vars and stack_vars:
                     # Find which ForEach scope has these variables
-                    correct_scope = None
-                    for scope_indent, scope_var in reversed(foreach_stack):
-                        if scope_var in referenced_vars or 'item' in referenced_vars:
-                            correct_scope = (scope_indent, scope_var)
-                            break
+                    correct_indent = None
+                    if 'item' in referenced_vars:
+                        correct_indent = stack_indents[-1]
+                    else:
+                        for k in range(len(stack_vars) - 1, -1, -1):
+                            if stack_vars[k] in referenced_vars:
+                                correct_indent = stack_indents[k]
+                                break
                     
-                    if correct_scope and swipeactions_indent <= correct_scope[0]:
-                        # swipeActions is at wrong level, need to move it
-                        continue  # Skip adding this line, we'll add it later
+                    if correct_indent is not None and swipeactions_indent <= correct_indent:
+                        # swipeActions is at wrong level, drop the modifier line;
+                        # its body lines flow through the loop below
+                        continue
                 
                 fixed_lines.append(line)
                 continue
             
-            # If we're capturing swipeActions block
-            if capturing_swipeactions:
-                swipeactions_block.append(line)
-                
-                # Check if block is complete (matching braces)
-                if line.strip() == '}' and len(swipeactions_block) > 2:
-                    capturing_swipeactions = False
-                    
-                    # Now intelligently place the swipeActions
-                    # This is complex - for now, add it back
-                    fixed_lines.extend(swipeactions_block[1:])
-                    swipeactions_block = []
-                continue
-            
             # Handle end of ForEach scopes
-            if line.strip() == '}' and foreach_stack:
+            if is_closing_brace and stack_indents:
                 # Check if this closes a ForEach
-                current_indent = len(line) - len(line.lstrip())
-                if foreach_stack and current_indent <= foreach_stack[-1][0]:
-                    foreach_stack.pop()
+                if len(line) - len(line.lstrip()) <= stack_indents[-1]:
+                    stack_indents.pop()
+                    var_name = stack_vars.pop()
+                    if var_counts[var_name] == 1:
+                        del var_counts[var_name]
+                    else:
+                        var_counts[var_name] -= 1
             
             fixed_lines.append(line)
         
         # More sophisticated fix for the specific swipeActions issue
-        fixed_content = '\n'.join(fixed_lines)
-        
         # Pattern: ForEach with items.filter followed by swipeActions referencing item
-        if 'ForEach(items.filter' in fixed_content and 'item.id' in fixed_content:
-            # Complex regex to properly restructure
-            pattern = r'(ForEach\(items\.filter[^}]+\)\s*\{\s*item\s+in\s+)([^}]+)\}\s*\.swipeActions\s*\{([^}]+)\}'
-            
-            def restructure_foreach(match):
-                foreach_start = match.group(1)
-                foreach_body = match.group(2)
-                swipeactions_body = match.group(3)
-                
-                # Rebuild with swipeActions attached to the row/view inside ForEach
-                # Find the main view in the ForEach body
-                if 'ReminderRow' in foreach_body or 'Row' in foreach_body:
-                    # Attach swipeActions to the Row
-                    foreach_body = foreach_body.rstrip()
-                    return f"{foreach_start}{foreach_body}\n                            .swipeActions {{{swipeactions_body}}}\n                        }}"
-                else:
-                    # Create a proper structure
-                    return f"{foreach_start}HStack {{ {foreach_body} }}\n                            .swipeActions {{{swipeactions_body}}}\n                        }}"
-            
-            fixed_content = re.sub(pattern, restructure_foreach, fixed_content, flags=re.DOTALL)
+        if any('ForEach(items.filter' in line for line in fixed_lines) and \
+           any('item.id' in line for line in fixed_lines):
+            joined = ''.join(fixed_lines)
+            restructured = _restructure_foreach_swipeactions(joined)
+            if restructured is not joined:
+                fixed_lines = restructured.splitlines(keepends=True)
         
         # Alternative: if item.id is referenced but item is not in scope
-        if 'item.id' in fixed_content and 'cannot find \'item\' in scope' in error:
-            # Find the context and fix it properly
-            lines = fixed_content.split('\n')
-            fixed_lines = []
-            
-            for i, line in enumerate(lines):
+        if 'cannot find \'item\' in scope' in error:
+            # Find the context and fix it properly, editing the line list in place
+            for i, line in enumerate(fixed_lines):
                 if 'item.id' in line and 'removeAll' in line:
                     # This is likely in a swipeActions block
                     # We need to restructure to have access to item
                     
                     # Look backwards to find the ForEach that should provide 'item'
                     for j in range(i-1, max(0, i-20), -1):
-                        if 'ForEach' in lines[j] and 'item in' in lines[j]:
+                        if 'ForEach' in fixed_lines[j] and 'item in' in fixed_lines[j]:
                             # We found the ForEach, the swipeActions should be inside it
                             # For now, replace with a working delete action
                             line = line.replace(
@@ -225,13 +363,12 @@ class AdvancedSwiftFixer:
                             'items.removeAll { $0.category == category && $0.id == item.id }',
                             '// TODO: Implement proper delete with item reference'
                         )
-                
-                fixed_lines.append(line)
-            
-            fixed_content = '\n'.join(fixed_lines)
+                    
+                    fixed_lines[i] = line
         
+        fixed_content = ''.join(fixed_lines)
         if fixed_content != content:
-            return fixed_content, "Fixed nested ForEach with swipeActions scope issue"
+            return fixed_content, _FIX_SWIPEACTIONS
         
         return content, None
     
@@ -244,33 +381,25 @@ class AdvancedSwiftFixer:
         - Missing $ prefix
         - Incorrect parameter passing
         """
+        original = content
         
         # Fix missing $ for @State variables in sheets
-        if 'sheet' in content:
+        # Each regex runs only when its literal prefix is present
+        if '.sheet(isPresented:' in content:
             # Pattern: .sheet(isPresented: showingSheet) should be .sheet(isPresented: $showingSheet)
-            content = re.sub(
-                r'\.sheet\(isPresented:\s+([a-zA-Z_]\w*)\)',
-                r'.sheet(isPresented: $\1)',
-                content
-            )
-            
-            # Fix sheet item bindings
-            content = re.sub(
-                r'\.sheet\(item:\s+([a-zA-Z_]\w*)\)',
-                r'.sheet(item: $\1)',
-                content
-            )
+            content = _SHEET_ISPRESENTED_RE.sub(r'.sheet(isPresented: $\1)', content)
+        
+        # Fix sheet item bindings
+        if '.sheet(item:' in content:
+            content = _SHEET_ITEM_RE.sub(r'.sheet(item: $\1)', content)
         
         # Fix NavigationLink bindings
-        if 'NavigationLink' in content:
-            content = re.sub(
-                r'NavigationLink\(isActive:\s+([a-zA-Z_]\w*)\)',
-                r'NavigationLink(isActive: $\1)',
-                content
-            )
+        if 'NavigationLink(isActive:' in content:
+            content = _NAVLINK_ISACTIVE_RE.sub(r'NavigationLink(isActive: $\1)', content)
         
-        if content != content:
-            return content, "Fixed sheet/navigation binding issues"
+        # re.sub returns the same object when nothing matched
+        if content is not original:
+            return content, _FIX_SHEET_BINDING
         
         return content, None
     
@@ -280,7 +409,7 @@ class AdvancedSwiftFixer:
         # Replace NavigationView with NavigationStack for iOS 16+
         if 'NavigationView' in content:
             content = content.replace('NavigationView', 'NavigationStack')
-            return content, "Updated NavigationView to NavigationStack for iOS 16+"
+            return content, _FIX_NAVIGATION_STACK
         
         return content, None
     
@@ -298,31 +427,30 @@ class AdvancedSwiftFixer:
         if 'await' in content and 'async' not in error:
             # Pattern: func name() -> Type { ... await ... }
             # Should be: func name() async -> Type { ... await ... }
-            content = re.sub(
-                r'(func\s+\w+\([^)]*\))\s*(->\s*[^{]+)\s*\{([^}]*await[^}]*)\}',
-                r'\1 async \2 {\3}',
-                content
-            )
+            content = _add_async_to_await_funcs(content)
         
         # Wrap async calls in Task when in non-async context
         if "'async' call in a function that does not support concurrency" in error:
             # Find the async call and wrap it
-            lines = content.split('\n')
+            lines = content.splitlines(keepends=True)
             fixed_lines = []
             
             for line in lines:
                 if 'await' in line and 'Task' not in line:
-                    # Wrap in Task
+                    # Wrap in Task, keeping the line's own terminator at the end
+                    body = line.rstrip('\r\n')
+                    ending = line[len(body):]
+                    newline = ending or '\n'
                     indent = len(line) - len(line.lstrip())
                     spaces = ' ' * indent
-                    fixed_lines.append(f"{spaces}Task {{")
-                    fixed_lines.append(f"    {line}")
-                    fixed_lines.append(f"{spaces}}}")
+                    fixed_lines.append(f"{spaces}Task {{{newline}")
+                    fixed_lines.append(f"    {body}{newline}")
+                    fixed_lines.append(f"{spaces}}}{ending}")
                 else:
                     fixed_lines.append(line)
             
-            content = '\n'.join(fixed_lines)
-            return content, "Wrapped async calls in Task blocks"
+            content = ''.join(fixed_lines)
+            return content, _FIX_ASYNC_TASK
         
         return content, None
     
@@ -337,13 +465,9 @@ class AdvancedSwiftFixer:
         """
         
         # Fix class conformance to ObservableObject
-        if '@Published' in content:
+        if '@Published' in content and 'class' in content:
             # Ensure class conforms to ObservableObject
-            content = re.sub(
-                r'class\s+(\w+)\s*(?!.*:\s*ObservableObject)',
-                r'class \1: ObservableObject',
-                content
-            )
+            content = _CLASS_DECL_RE.sub(r'class \1: ObservableObject', content)
         
         # Fix @ObservedObject vs @StateObject usage
         # @StateObject should be used for owned objects (created in the view)
@@ -352,22 +476,35 @@ class AdvancedSwiftFixer:
         # This requires context analysis - for now, ensure consistency
         if '@ObservedObject' in content and 'init(' in content:
             # If the object is initialized in init, it should probably be @StateObject
-            lines = content.split('\n')
+            lines = content.splitlines(keepends=True)
+            
+            # One pass collects the @ObservedObject declarations and, per
+            # variable name, the lines assigning it outside an init(
+            declarations = []
+            assigned: Dict[str, List[int]] = {}
             for i, line in enumerate(lines):
                 if '@ObservedObject' in line:
-                    # Check if this is initialized in the view
-                    var_match = re.search(r'@ObservedObject\s+(?:private\s+)?var\s+(\w+)', line)
+                    var_match = _OBSERVED_VAR_RE.search(line)
                     if var_match:
-                        var_name = var_match.group(1)
-                        # Look for initialization
-                        for j in range(i, min(i+20, len(lines))):
-                            if f'{var_name} = ' in lines[j] and 'init(' not in lines[j]:
-                                # This is initialized in the view, should be @StateObject
-                                lines[i] = line.replace('@ObservedObject', '@StateObject')
-                                break
+                        declarations.append((i, var_match.group(1)))
+                if ' = ' in line and 'init(' not in line:
+                    for name in _ASSIGNED_NAME_RE.findall(line):
+                        assigned.setdefault(name, []).append(i)
+            
+            changed = False
+            for i, var_name in declarations:
+                # Initialized in the view within 20 lines of the declaration
+                # (the declaration line included), so should be @StateObject
+                rows = assigned.get(var_name)
+                if rows:
+                    k = bisect.bisect_left(rows, i)
+                    if k < len(rows) and rows[k] < i + 20:
+                        lines[i] = lines[i].replace('@ObservedObject', '@StateObject')
+                        changed = True
             
-            content = '\n'.join(lines)
-            return content, "Fixed @ObservedObject vs @StateObject usage"
+            if changed:
+                content = ''.join(lines)
+            return content, _FIX_STATE_OBJECT
         
         return content, None
     
@@ -387,28 +524,41 @@ class AdvancedSwiftFixer:
             # This is complex - would need proper parsing
             # For now, suggest using Group
             if '// Group wrapper needed' not in content:
-                lines = content.split('\n')
+                lines = content.splitlines(keepends=True)
+                
+                # Per-line brace flags and child eligibility, computed once
+                # rather than rescanned for every enclosing stack
+                line_info = []
+                for line in lines:
+                    stripped = line.strip()
+                    line_info.append((
+                        '{' in line,
+                        '}' in line,
+                        bool(stripped) and not stripped.startswith('//')
+                    ))
+                
                 for i, line in enumerate(lines):
                     if 'VStack' in line or 'HStack' in line:
                         # Count the direct children (approximate)
                         brace_count = 0
                         child_count = 0
-                        for j in range(i+1, min(i+50, len(lines))):
-                            if '{' in lines[j]:
+                        for has_open, has_close, is_child in line_info[i+1:i+50]:
+                            if has_open:
                                 brace_count += 1
-                            if '}' in lines[j]:
+                            if has_close:
                                 brace_count -= 1
                                 if brace_count == 0:
                                     break
-                            if brace_count == 1 and lines[j].strip() and not lines[j].strip().startswith('//'):
+                            if brace_count == 1 and is_child:
                                 child_count += 1
                         
                         if child_count > 10:
                             # Add comment suggesting Group
-                            lines[i] += '  // Warning: Too many children, consider using Group'
+                            body = lines[i].rstrip('\r\n')
+                            lines[i] = body + '  // Warning: Too many children, consider using Group' + lines[i][len(body):]
                 
-                content = '\n'.join(lines)
-                return content, "Added warning for excessive ViewBuilder children"
+                content = ''.join(lines)
+                return content, _FIX_VIEW_BUILDER
         
         return content, None
 
@@ -424,39 +574,62 @@ class SwiftPatternAnalyzer:
         Analyze the scope chain in Swift code
         Returns a tree of scopes with available variables
         """
-        scopes = []
-        current_scope = SwiftScope('file', [])
-        
-        lines = content.split('\n')
-        for line in lines:
-            # Detect ForEach and its variable
-            foreach_match = re.search(r'ForEach\([^)]+\)\s*\{\s*(\w+)\s+in', line)
-            if foreach_match:
-                var_name = foreach_match.group(1)
-                new_scope = SwiftScope('ForEach', [var_name], current_scope)
-                current_scope.children.append(new_scope)
-                current_scope = new_scope
+        root = SwiftScope('file', [])
+        current_scope = root
+        
+        # One SwiftScope or None (plain block) per open brace, so every '}'
+        # pops exactly what its '{' pushed
+        brace_stack: List[Optional[SwiftScope]] = []
+        paren_depth = 0
+        pending = None          # scope type the next '{' opens: 'ForEach', 'function', 'closure'
+        pending_parens = 0      # paren depth at which the pending header started
+        binding_scope = None    # ForEach scope waiting for its `name in` binding
+        binding_name = None
+        
+        for match in _SCOPE_TOKEN_RE.finditer(content):
+            token = match.group()
+            first = token[0]
             
-            # Detect function scope
-            func_match = re.search(r'func\s+(\w+)\([^)]*\)', line)
-            if func_match:
-                func_name = func_match.group(1)
-                new_scope = SwiftScope('function', [], current_scope)
-                current_scope.children.append(new_scope)
-                current_scope = new_scope
+            # Strings and comments carry no structure
+            if first == '"' or first == '/':
+                continue
             
-            # Detect closure scope
-            if '{' in line and '->' in line:
-                # This might be a closure
-                new_scope = SwiftScope('closure', [], current_scope)
-                current_scope.children.append(new_scope)
-                current_scope = new_scope
+            # ForEach closure binding: `{ name in`
+            if binding_scope is not None:
+                if binding_name is None and (first.isalpha() or first == '_'):
+                    binding_name = token
+                    continue
+                if binding_name is not None and token == 'in':
+                    binding_scope.variables.append(binding_name)
+                binding_scope = binding_name = None
             
-            # Handle scope closing
-            if '}' in line and current_scope.parent:
-                current_scope = current_scope.parent
-        
-        return {'root': scopes[0] if scopes else current_scope}
+            if token == '(':
+                paren_depth += 1
+            elif token == ')':
+                paren_depth -= 1
+            elif token == '{':
+                if pending is not None and paren_depth == pending_parens:
+                    new_scope = SwiftScope(pending, [], current_scope)
+                    current_scope.children.append(new_scope)
+                    current_scope = new_scope
+                    brace_stack.append(new_scope)
+                    if pending == 'ForEach':
+                        binding_scope = new_scope
+                    pending = None
+                else:
+                    brace_stack.append(None)
+            elif token == '}':
+                if brace_stack and brace_stack.pop() is not None and current_scope.parent:
+                    current_scope = current_scope.parent
+            elif token == 'ForEach' or token == 'func':
+                pending = 'ForEach' if token == 'ForEach' else 'function'
+                pending_parens = paren_depth
+            elif token == '->':
+                if pending is None:
+                    pending = 'closure'
+                    pending_parens = paren_depth
+        
+        return {'root': root}
     
     @staticmethod
     def suggest_fix_for_scope_error(content: str, variable: str, error_line: int) -> str:
@@ -485,4 +658,11 @@ def fix_complex_swift_issues(content: str, error_output: str) -> Tuple[str, List
     Main entry point for fixing complex Swift issues
     Returns: (fixed_content, list_of_fixes_applied)
     """
-    return advanced_fixer.fix_complex_swift_code(content, error_output)
\ No newline at end of file
+    fixed_content, fixes = _fix_complex_swift_issues_cached(content, error_output)
+    return fixed_content, list(fixes)
+
+@functools.lru_cache(maxsize=256)
+def _fix_complex_swift_issues_cached(content: str, error_output: str) -> Tuple[str, Tuple[str, ...]]:
+    """Memoized fix for retry loops that resubmit the same content and errors"""
+    fixed_content, fixes = advanced_fixer.fix_complex_swift_code(content, error_output)
+    return fixed_content, tuple(fixes)
\ No newline at end of file
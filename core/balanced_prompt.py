@@ -3,26 +3,16 @@ Balanced Prompt Builder - Ensures App Store quality without over-restriction
 Follows Apple HIG while allowing creative freedom
 """
 
-class BalancedPromptBuilder:
-    """
-    Creates prompts that balance:
-    - App Store approval requirements
-    - Apple HIG guidelines
-    - Creative freedom for unique apps
-    - Technical best practices
-    """
-    
-    @staticmethod
-    def build_generation_prompt(requirements: dict) -> str:
-        """
-        Build a balanced prompt that ensures quality without being overly prescriptive
-        """
-        app_name = requirements['app_name']
-        app_type = requirements.get('app_type', 'innovative')
-        features = requirements.get('must_have_features', [])
-        
-        # Essential App Store requirements (non-negotiable)
-        essential_requirements = """
+import re
+
+# Postfix force unwraps (`value!.x`, `call()!`, `dict[k]!` at end of line)
+# and forced casts/tries (`as!`, `try!`); plain `!` negation and `!=` don't match
+_FORCE_UNWRAP_RE = re.compile(r'(?<=[\w)\]])!(?=[.,)\]]|[ \t]*$)|\b(?:as|try)!', re.MULTILINE)
+
+# Static prompt sections, built once at import
+
+# Essential App Store requirements (non-negotiable)
+_ESSENTIAL_REQUIREMENTS = """
 ESSENTIAL APP STORE REQUIREMENTS:
 • iOS 16.0+ minimum deployment (covers 95%+ of devices)
 • Proper Info.plist configuration
@@ -32,8 +22,8 @@ ESSENTIAL APP STORE REQUIREMENTS:
 • Privacy-compliant (no unauthorized data collection)
 """
 
-        # HIG guidelines (important but flexible)
-        hig_guidelines = """
+# HIG guidelines (important but flexible)
+_HIG_GUIDELINES = """
 APPLE HIG PRINCIPLES (interpret creatively):
 • Clarity - Interface should be intuitive and focused
 • Deference - Content is primary, UI supports it
@@ -42,8 +32,8 @@ APPLE HIG PRINCIPLES (interpret creatively):
 • Respect platform conventions while innovating
 """
 
-        # Technical best practices (recommended, not required)
-        best_practices = """
+# Technical best practices (recommended, not required)
+_BEST_PRACTICES = """
 RECOMMENDED BEST PRACTICES:
 • State management: @State for view state, @StateObject for shared state
 • Animations: Use .animation() for smooth transitions when it enhances UX
@@ -53,8 +43,8 @@ RECOMMENDED BEST PRACTICES:
 • Performance: Lazy loading for lists, avoid unnecessary re-renders
 """
 
-        # Creative freedom encouragement
-        creative_freedom = """
+# Creative freedom encouragement
+_CREATIVE_FREEDOM = """
 CREATIVE FREEDOM:
 • You're building something unique - don't just copy existing apps
 • Innovate within the guidelines - Apple loves apps that push boundaries respectfully
@@ -63,41 +53,27 @@ CREATIVE FREEDOM:
 • Surprise users with thoughtful details
 """
 
-        # Build the final prompt
-        prompt = f"""Create a SwiftUI iOS app: {app_name}
+# Leading, request-independent part of the generation prompt. Provider prompt
+# caches match on an exact prefix, so nothing app-specific may appear here.
+_GENERATION_PREFIX = f"""Create a SwiftUI iOS app following these guidelines.
 
-PURPOSE: {app_type} app{f' with {", ".join(features)}' if features else ''}
+{_ESSENTIAL_REQUIREMENTS}
 
-{essential_requirements}
+{_HIG_GUIDELINES}
 
-{hig_guidelines}
+{_BEST_PRACTICES}
 
-{best_practices}
-
-{creative_freedom}
-
-DELIVERABLES:
-1. ContentView.swift - Main UI implementation
-2. {app_name}App.swift - App entry point
+{_CREATIVE_FREEDOM}
 
 Focus on creating something that:
 ✓ Would pass App Store review
 ✓ Users would actually want to use
 ✓ Shows attention to detail
 ✓ Feels native to iOS while being unique
-
-Return JSON: {{files: [{{path, content}}], app_name, bundle_id}}
 """
-        return prompt
-    
-    @staticmethod
-    def get_modification_prompt(existing_code: str, modification_request: str) -> str:
-        """
-        Balanced prompt for modifications
-        """
-        return f"""Modify this iOS app based on user request.
 
-USER REQUEST: {modification_request}
+# Leading, request-independent part of the modification prompt
+_MODIFICATION_PREFIX = """Modify this iOS app based on the user request below.
 
 MODIFICATION PRINCIPLES:
 • Maintain existing app quality and style
@@ -106,9 +82,6 @@ MODIFICATION PRINCIPLES:
 • Test that all existing features still work
 • Add smooth transitions for any UI changes
 
-CURRENT CODE TO MODIFY:
-{existing_code[:2000]}...
-
 Make the requested changes while:
 1. Preserving what works well
 2. Improving overall quality if possible
@@ -116,6 +89,76 @@ Make the requested changes while:
 4. Ensuring backward compatibility
 
 Return complete modified code, not just changes.
+"""
+
+class BalancedPromptBuilder:
+    """
+    Creates prompts that balance:
+    - App Store approval requirements
+    - Apple HIG guidelines
+    - Creative freedom for unique apps
+    - Technical best practices
+    """
+    
+    @staticmethod
+    def build_generation_prompt(requirements: dict) -> str:
+        """
+        Build a balanced prompt that ensures quality without being overly prescriptive
+        """
+        app_name = requirements['app_name']
+        app_type = requirements.get('app_type', 'innovative')
+        features = requirements.get('must_have_features', [])
+        feat_suffix = f' with {", ".join(features)}' if features else ''
+        
+        # Build the final prompt: the static guideline prefix comes first so
+        # repeated generations share an identical, cacheable prompt prefix
+        prompt = f"""{_GENERATION_PREFIX}
+APP SPECIFICS:
+• Name: {app_name}
+• Purpose: {app_type} app{feat_suffix}
+
+DELIVERABLES:
+1. ContentView.swift - Main UI implementation
+2. {app_name}App.swift - App entry point
+
+Return JSON: {{files: [{{path, content}}], app_name, bundle_id}}
+"""
+        return prompt
+    
+    @staticmethod
+    def build_batched_generation_prompt(requirements_list: list) -> str:
+        """
+        Build one prompt that generates several apps, sharing the static
+        guideline prefix instead of repeating it in a prompt per app
+        """
+        app_specs = []
+        for index, requirements in enumerate(requirements_list, 1):
+            app_name = requirements['app_name']
+            app_type = requirements.get('app_type', 'innovative')
+            features = requirements.get('must_have_features', [])
+            feat_suffix = f' with {", ".join(features)}' if features else ''
+            app_specs.append(f"{index}. {app_name} - {app_type} app{feat_suffix}\n"
+                             f"   Files: ContentView.swift, {app_name}App.swift")
+        
+        apps = '\n'.join(app_specs)
+        return f"""{_GENERATION_PREFIX}
+GENERATE THE FOLLOWING {len(requirements_list)} APPS:
+{apps}
+
+Return JSON: {{apps: [{{index, files: [{{path, content}}], app_name, bundle_id}}]}} with one entry per app, in the order listed
+"""
+    
+    @staticmethod
+    def get_modification_prompt(existing_code: str, modification_request: str) -> str:
+        """
+        Balanced prompt for modifications
+        """
+        # Static principles first, request and code last (see build_generation_prompt)
+        return f"""{_MODIFICATION_PREFIX}
+USER REQUEST: {modification_request}
+
+CURRENT CODE TO MODIFY:
+{existing_code[:2000]}...
 """
     
     @staticmethod
@@ -127,13 +170,8 @@ Return complete modified code, not just changes.
         issues = []
         warnings = []
         
-        # Combine both files for checking
-        full_code = code
-        if app_code:
-            full_code = code + '\n' + app_code
-        
-        # Critical checks (would cause rejection)
-        if '@main' not in full_code:
+        # Critical checks (would cause rejection); @main may be in either file
+        if '@main' not in code and not (app_code and '@main' in app_code):
             issues.append("Missing @main app entry point")
         
         if 'struct ContentView' not in code and 'class ContentView' not in code:
@@ -143,7 +181,7 @@ Return complete modified code, not just changes.
         if 'fatalError(' in code and '// TODO' not in code:
             issues.append("Contains fatalError that could crash app")
         
-        if 'force unwrap' in code.lower() or '!' in code:
+        if _FORCE_UNWRAP_RE.search(code):
             # Only warn, don't block - force unwrapping is sometimes OK
             warnings.append("Contains force unwrapping - verify it's safe")
         
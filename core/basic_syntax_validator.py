@@ -4,7 +4,264 @@ Catches simple syntax errors before compilation
 """
 
 import re
-from typing import List, Dict, Tuple
+import array
+import functools
+import logging
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import List, Dict, Tuple, Iterator, Union
+
+logger = logging.getLogger(__name__)
+
+class IssueCode(IntEnum):
+    """Issue kinds reported by the validator; fix_basic_issues dispatches on these"""
+    EXTRA_CLOSING_PAREN = 1
+    EXTRA_CLOSING_BRACKET = 2
+    ORPHAN_PAREN = 3
+    MALFORMED_TERNARY = 4
+    INCOMPLETE_TERNARY = 5
+    MISSING_UIKIT = 6
+    MISSING_FOUNDATION = 7
+    ENVIRONMENT_TYPO = 8
+    FOREGROUND_TYPO = 9
+
+# Message and severity for each issue code
+_ISSUE_INFO = {
+    IssueCode.EXTRA_CLOSING_PAREN: ('Extra closing parenthesis', 'error'),
+    IssueCode.EXTRA_CLOSING_BRACKET: ('Extra closing bracket', 'error'),
+    IssueCode.ORPHAN_PAREN: ('Orphaned closing parenthesis', 'error'),
+    IssueCode.MALFORMED_TERNARY: ('Malformed ternary operator - missing true/false values', 'error'),
+    IssueCode.INCOMPLETE_TERNARY: ('Incomplete ternary operator', 'error'),
+    IssueCode.MISSING_UIKIT: ('Missing import UIKit for haptic feedback', 'error'),
+    IssueCode.MISSING_FOUNDATION: ('Missing import Foundation for Timer', 'warning'),
+    IssueCode.ENVIRONMENT_TYPO: ('@Enviroment should be @Environment', 'error'),
+    IssueCode.FOREGROUND_TYPO: ('forground should be foreground', 'error'),
+}
+
+# Message -> code, for issue dicts predating the 'code' key
+_ISSUE_CODES_BY_MESSAGE = {message: code for code, (message, _) in _ISSUE_INFO.items()}
+
+@dataclass
+class Issues:
+    """
+    Validator findings as parallel line/code arrays instead of one dict per
+    issue; message and severity are looked up from the code when needed
+    """
+    lines: array.array = field(default_factory=lambda: array.array('i'))
+    codes: array.array = field(default_factory=lambda: array.array('B'))
+    
+    def append(self, line: int, code: IssueCode) -> None:
+        self.lines.append(line)
+        self.codes.append(code)
+    
+    def __len__(self) -> int:
+        return len(self.lines)
+    
+    def __iter__(self) -> Iterator[Tuple[int, IssueCode]]:
+        for line, code in zip(self.lines, self.codes):
+            yield line, IssueCode(code)
+    
+    def as_dicts(self) -> List[Dict]:
+        """The list-of-dicts shape validate_swift_file has always returned"""
+        result = []
+        for line, code in self:
+            message, severity = _ISSUE_INFO[code]
+            result.append({'line': line, 'code': code, 'issue': message, 'severity': severity})
+        return result
+    
+    def without(self, codes: 'frozenset[IssueCode]') -> 'Issues':
+        """Copy with every issue whose code is in codes dropped"""
+        result = Issues()
+        for line, code in zip(self.lines, self.codes):
+            if code not in codes:
+                result.append(line, code)
+        return result
+    
+    @classmethod
+    def from_dicts(cls, issues: List[Dict]) -> 'Issues':
+        """
+        Inverse of as_dicts. Dicts without a 'code' (the older
+        line/issue/severity shape) are mapped back by message; ones that
+        match no known issue are skipped
+        """
+        result = cls()
+        for issue in issues:
+            code = issue.get('code')
+            if code is None:
+                code = _ISSUE_CODES_BY_MESSAGE.get(issue.get('issue'))
+                if code is None:
+                    continue
+            result.append(issue.get('line', 0), code)
+        return result
+
+# Common typos as (misspellings, code). With only three needles, separate
+# substring tests are faster than one compiled alternation: each `in` is a
+# C-level search, while the alternation runs the regex engine per character.
+_TYPO_CHECKS = (
+    (('@Enviroment',), IssueCode.ENVIRONMENT_TYPO),
+    (('.forgroundColor', '.forgroundStyle'), IssueCode.FOREGROUND_TYPO),
+)
+
+# Misspelling -> (issue code, correction) for the typo fixes
+_TYPO_FIXES = {
+    '@Enviroment': (IssueCode.ENVIRONMENT_TYPO, '@Environment'),
+    '.forgroundColor': (IssueCode.FOREGROUND_TYPO, '.foregroundColor'),
+    '.forgroundStyle': (IssueCode.FOREGROUND_TYPO, '.foregroundStyle'),
+}
+_TYPO_FIX_CODES = frozenset(code for code, _ in _TYPO_FIXES.values())
+_TYPO_FIX_RE = re.compile('|'.join(map(re.escape, _TYPO_FIXES)))
+
+# A line that is just ')' plus anything not continuing an expression or
+# closing another scope ('.', ',', ';', '}', ']')
+_ORPHAN_PAREN_RE = re.compile(r'\)[^.,;}\]]*')
+
+# View initializers where LLM output often puts the closing parenthesis on the
+# wrong line (e.g. LinearGradient/GeometryReader/VStack/HStack/ZStack)
+_VIEW_INITIALIZERS = ('LinearGradient(', 'GeometryReader', 'VStack', 'HStack', 'ZStack',
+                      'NavigationView', 'ScrollView', 'List(', 'ForEach(', 'Group(')
+
+# Modifier patterns that often have missing closing parentheses
+_MODIFIER_PATTERNS = ('.gesture(', '.onTapGesture(', '.sheet(', '.alert(',
+                      '.overlay(', '.background(', '.onChange(', '.onAppear(',
+                      '.onDisappear(', '.task(', '.onReceive(')
+
+# Candidate-line tests: one alternation search per line beats ten-odd
+# substring tests on short source lines. The same holds for the whole-file
+# trigger check over all 21 needles: the alternation is ~2x faster than 21
+# `in` scans when nothing matches, and stops at the first match (usually
+# an early VStack) where the `in` tests would scan for each needle in turn
+_VIEW_INITIALIZER_RE = re.compile('|'.join(map(re.escape, _VIEW_INITIALIZERS)))
+_MODIFIER_RE = re.compile('|'.join(map(re.escape, _MODIFIER_PATTERNS)))
+_STRUCTURAL_TRIGGER_RE = re.compile('|'.join(map(re.escape, _VIEW_INITIALIZERS + _MODIFIER_PATTERNS)))
+
+# Tokenizer states for _code_lines
+_NORMAL, _BLOCK_COMMENT, _STRING, _TRIPLE_STRING = range(4)
+
+# Complete string literals and line comments on a line with no escapes
+_SIMPLE_LITERAL_RE = re.compile(r'"[^"]*"|//.*')
+
+# Characters that can change tokenizer state, per state
+_CODE_SPECIAL_RE = re.compile(r'["/]')
+_INTERPOLATION_SPECIAL_RE = re.compile(r'["/()]')
+_COMMENT_SPECIAL_RE = re.compile(r'/\*|\*/')
+_STRING_SPECIAL_RE = re.compile(r'[\\"]')
+
+# Bracket characters for the balance check's per-character fallback
+_BRACKET_RE = re.compile(r'[()\[\]]')
+
+def _blank(match: 're.Match[str]') -> str:
+    return ' ' * (match.end() - match.start())
+
+@functools.lru_cache(maxsize=64)
+def _code_lines(content: str) -> Tuple[str, ...]:
+    """
+    Split content into lines with comments and string literal text blanked
+    out, so the balance and ternary checks only see real code. Blanking keeps
+    column positions; string interpolations (\\(...)) stay visible as code.
+    Memoized so the validator and fixer share one tokenization of a file.
+    """
+    out = []
+    state = _NORMAL
+    comment_depth = 0
+    # Open interpolations as [enclosing string state, unclosed '(' count]
+    interpolations: List[List[int]] = []
+    
+    for line in content.split('\n'):
+        if state == _NORMAL:
+            # Nothing to tokenize on plain code lines
+            if '"' not in line and '/' not in line:
+                out.append(line)
+                continue
+            # Without escapes, block comments or multi-line strings, paired
+            # quotes can be blanked by one regex pass instead of the char loop
+            if ('\\' not in line and '/*' not in line and '"""' not in line
+                    and not line.count('"') % 2):
+                out.append(_SIMPLE_LITERAL_RE.sub(_blank, line))
+                continue
+        
+        chars = list(line)
+        i = 0
+        n = len(line)
+        while i < n:
+            if state == _NORMAL:
+                # Jump straight to the next character that can change state
+                match = (_INTERPOLATION_SPECIAL_RE if interpolations else _CODE_SPECIAL_RE).search(line, i)
+                if match is None:
+                    break
+                i = match.start()
+                c = line[i]
+                if c == '/':
+                    if line.startswith('//', i):
+                        chars[i:] = ' ' * (n - i)
+                        break
+                    if line.startswith('/*', i):
+                        state = _BLOCK_COMMENT
+                        comment_depth = 1
+                        chars[i] = chars[i + 1] = ' '
+                        i += 2
+                        continue
+                elif c == '"':
+                    if line.startswith('"""', i):
+                        state = _TRIPLE_STRING
+                        chars[i:i + 3] = '   '
+                        i += 3
+                        continue
+                    state = _STRING
+                    chars[i] = ' '
+                elif c == '(':
+                    interpolations[-1][1] += 1
+                elif interpolations[-1][1]:
+                    interpolations[-1][1] -= 1
+                else:
+                    # Closes the interpolation; the '\\(' was blanked too
+                    state = interpolations.pop()[0]
+                    chars[i] = ' '
+                i += 1
+                continue
+            
+            # Inside a comment or string everything up to the next
+            # delimiter is blanked in one slice
+            match = (_COMMENT_SPECIAL_RE if state == _BLOCK_COMMENT else _STRING_SPECIAL_RE).search(line, i)
+            if match is None:
+                chars[i:] = ' ' * (n - i)
+                break
+            start = match.start()
+            chars[i:start] = ' ' * (start - i)
+            i = start
+            c = line[i]
+            if state == _BLOCK_COMMENT:
+                # Swift block comments nest
+                if c == '/':
+                    comment_depth += 1
+                else:
+                    comment_depth -= 1
+                    if not comment_depth:
+                        state = _NORMAL
+                chars[i] = chars[i + 1] = ' '
+                i += 2
+                continue
+            if c == '\\' and i + 1 < n:
+                chars[i] = chars[i + 1] = ' '
+                if line[i + 1] == '(':
+                    interpolations.append([state, 0])
+                    state = _NORMAL
+                i += 2
+                continue
+            if c == '"' and (state == _STRING or line.startswith('"""', i)):
+                width = 1 if state == _STRING else 3
+                chars[i:i + width] = ' ' * width
+                state = _NORMAL
+                i += width
+                continue
+            chars[i] = ' '
+            i += 1
+        
+        # Single-line string literals can't continue onto the next line
+        if state == _STRING:
+            state = _NORMAL
+        out.append(''.join(chars))
+    
+    return tuple(out)
 
 class BasicSyntaxValidator:
     """
@@ -17,216 +274,124 @@ class BasicSyntaxValidator:
         Check for basic syntax errors in Swift code
         Returns list of issues found
         """
-        issues = []
-        lines = content.split('\n')
+        return BasicSyntaxValidator.scan_issues(content).as_dicts()
+    
+    @staticmethod
+    def scan_issues(content: str) -> Issues:
+        """
+        Check for basic syntax errors in Swift code
+        Returns the issues found in columnar form
+        """
+        issues = Issues()
+        # Lines with comments and string contents blanked, so a ')' or '?'
+        # inside a literal can't be reported as a syntax error
+        lines = _code_lines(content)
+        source_lines = content.split('\n')
         
-        # Check for balanced parentheses, brackets, and braces
+        # Check for balanced parentheses and brackets
         paren_count = 0
         bracket_count = 0
-        brace_count = 0
         
         for i, line in enumerate(lines, 1):
-            # Skip comments
-            if line.strip().startswith('//'):
+            stripped = line.strip()
+            
+            # Blank or comment-only line
+            if not stripped:
                 continue
             
-            # Count parentheses
-            for char in line:
-                if char == '(':
-                    paren_count += 1
-                elif char == ')':
-                    paren_count -= 1
-                    if paren_count < 0:
-                        issues.append({
-                            'line': i,
-                            'issue': 'Extra closing parenthesis',
-                            'severity': 'error'
-                        })
-                        paren_count = 0  # Reset to avoid cascading errors
-                
-                elif char == '[':
-                    bracket_count += 1
-                elif char == ']':
-                    bracket_count -= 1
-                    if bracket_count < 0:
-                        issues.append({
-                            'line': i,
-                            'issue': 'Extra closing bracket',
-                            'severity': 'error'
-                        })
-                        bracket_count = 0
-                
-                elif char == '{':
-                    brace_count += 1
-                elif char == '}':
-                    brace_count -= 1
+            # Count with str.count; a line can only drive a count negative
+            # (and need the per-character scan) if it closes more than is open
+            close_parens = line.count(')')
+            close_brackets = line.count(']')
+            if close_parens <= paren_count and close_brackets <= bracket_count:
+                paren_count += line.count('(') - close_parens
+                bracket_count += line.count('[') - close_brackets
+            else:
+                # Only bracket characters matter; let the regex engine skip the rest
+                for char in _BRACKET_RE.findall(line):
+                    if char == '(':
+                        paren_count += 1
+                    elif char == ')':
+                        paren_count -= 1
+                        if paren_count < 0:
+                            issues.append(i, IssueCode.EXTRA_CLOSING_PAREN)
+                            paren_count = 0  # Reset to avoid cascading errors
+                    
+                    elif char == '[':
+                        bracket_count += 1
+                    elif char == ']':
+                        bracket_count -= 1
+                        if bracket_count < 0:
+                            issues.append(i, IssueCode.EXTRA_CLOSING_BRACKET)
+                            bracket_count = 0
             
             # Check for orphaned parentheses at the start of a line
-            stripped = line.strip()
-            if stripped == ')' or (stripped.startswith(')') and not any(c in stripped for c in ['.', ',', ';', '}', ']'])):
-                issues.append({
-                    'line': i,
-                    'issue': 'Orphaned closing parenthesis',
-                    'severity': 'error'
-                })
+            if stripped.startswith(')') and _ORPHAN_PAREN_RE.fullmatch(stripped):
+                issues.append(i, IssueCode.ORPHAN_PAREN)
             
             # Check for malformed ternary operators (e.g., "condition ?)" without true/false values)
             if '?)' in line and ':' not in line:
-                issues.append({
-                    'line': i,
-                    'issue': 'Malformed ternary operator - missing true/false values',
-                    'severity': 'error'
-                })
+                issues.append(i, IssueCode.MALFORMED_TERNARY)
             
             # Check for incomplete ternary on current and next line
             if '?' in line and ':' not in line:
-                # Check if colon is on the next line
-                if i + 1 < len(lines) and ':' not in lines[i + 1]:
-                    issues.append({
-                        'line': i,
-                        'issue': 'Incomplete ternary operator',
-                        'severity': 'error'
-                    })
+                # Check if colon is on the next line (in the raw source, as before)
+                if i + 1 < len(lines) and ':' not in source_lines[i + 1]:
+                    issues.append(i, IssueCode.INCOMPLETE_TERNARY)
         
         # Check for missing imports
         if 'UINotificationFeedbackGenerator' in content or 'UIImpactFeedbackGenerator' in content:
             if 'import UIKit' not in content:
-                issues.append({
-                    'line': 0,
-                    'issue': 'Missing import UIKit for haptic feedback',
-                    'severity': 'error'
-                })
+                issues.append(0, IssueCode.MISSING_UIKIT)
         
         if 'Timer' in content and 'AppTimer' not in content:  # Using Timer but not custom AppTimer
             if 'import Foundation' not in content:
-                issues.append({
-                    'line': 0,
-                    'issue': 'Missing import Foundation for Timer',
-                    'severity': 'warning'
-                })
+                issues.append(0, IssueCode.MISSING_FOUNDATION)
         
         # Check for common typos
-        if '@Enviroment' in content:
-            issues.append({
-                'line': 0,
-                'issue': '@Enviroment should be @Environment',
-                'severity': 'error'
-            })
-        
-        if '.forgroundColor' in content or '.forgroundStyle' in content:
-            issues.append({
-                'line': 0,
-                'issue': 'forground should be foreground',
-                'severity': 'error'
-            })
+        for typos, code in _TYPO_CHECKS:
+            if any(typo in content for typo in typos):
+                issues.append(0, code)
         
         return issues
     
     @staticmethod
-    def fix_basic_issues(content: str, issues: List[Dict]) -> str:
+    def fix_basic_issues(content: str, issues: Union[Issues, List[Dict]]) -> str:
         """
         Attempt to fix basic syntax issues automatically
         """
+        if not isinstance(issues, Issues):
+            issues = Issues.from_dicts(issues)
+        return BasicSyntaxValidator._apply_fixes(content, issues)[0]
+    
+    @staticmethod
+    def _apply_fixes(content: str, issues: Issues) -> Tuple[str, bool]:
+        """
+        fix_basic_issues, also reporting whether any edit went beyond a typo
+        rename (i.e. added, removed or restructured code on some line)
+        """
         lines = content.split('\n')
+        lines_changed = False
+        # The structural passes only act on lines with a modifier or view
+        # initializer, so skip them outright when the file has neither
+        if _STRUCTURAL_TRIGGER_RE.search(content):
+            lines_changed = BasicSyntaxValidator._fix_unclosed_parentheses(lines, list(_code_lines(content)))
         
-        # First, fix specific LinearGradient/GeometryReader/VStack/HStack/ZStack pattern issue
-        # This is a common LLM generation error where closing parenthesis is on wrong line
-        view_initializers = ['LinearGradient(', 'GeometryReader', 'VStack', 'HStack', 'ZStack', 
-                             'NavigationView', 'ScrollView', 'List(', 'ForEach(', 'Group(']
-        
-        # Also check for modifier patterns that often have missing closing parentheses
-        modifier_patterns = ['.gesture(', '.onTapGesture(', '.sheet(', '.alert(', 
-                           '.overlay(', '.background(', '.onChange(', '.onAppear(',
-                           '.onDisappear(', '.task(', '.onReceive(']
-        
-        # First handle modifier patterns with closures (like .gesture)
-        # This is CRITICAL for fixing common LLM generation errors
-        for i in range(len(lines)):
-            # Check for modifiers that start a closure
-            for mod in modifier_patterns:
-                if mod in lines[i]:
-                    # Found a modifier with potential closure
-                    # Count all parentheses from this point until we balance or hit another structure
-                    open_count = 0
-                    close_count = 0
-                    closure_end = -1
-                    
-                    # Start counting from this line
-                    for j in range(i, min(i + 50, len(lines))):
-                        open_count += lines[j].count('(')
-                        close_count += lines[j].count(')')
-                        
-                        # Look for the end of the closure (usually a line with just whitespace after })
-                        # Or when we see another major structure starting
-                        if j > i and (
-                            ('}' in lines[j] and (j + 1 >= len(lines) or not lines[j + 1].strip() or lines[j + 1].strip().startswith('.'))) or
-                            (j > i + 2 and any(struct in lines[j] for struct in ['struct ', 'class ', 'func ', 'var body:']))
-                        ):
-                            closure_end = j
-                            break
-                    
-                    # If we found unbalanced parentheses
-                    if closure_end > 0 and open_count > close_count:
-                        # Add the missing closing parenthesis on the line with the closing brace
-                        missing = ')' * (open_count - close_count)
-                        # If the line ends with }, add the ) after it
-                        if lines[closure_end].rstrip().endswith('}'):
-                            # Find the indentation of the closing brace
-                            indent = len(lines[closure_end]) - len(lines[closure_end].lstrip())
-                            lines[closure_end] = lines[closure_end].rstrip() + missing
-                        else:
-                            # Otherwise add it at the end of the line
-                            lines[closure_end] = lines[closure_end].rstrip() + missing
-                        break  # Fixed this one, move to next line
-        
-        for i in range(len(lines)):
-            # Check for view initializers that might have misplaced closing parenthesis
-            if any(init in lines[i] for init in view_initializers):
-                # Look ahead for a line that starts with a dot (SwiftUI modifier)
-                # but appears before the closing parenthesis
-                for j in range(i + 1, min(i + 15, len(lines))):
-                    curr_line = lines[j].strip()
-                    
-                    # If we find a modifier line (starts with .)
-                    if curr_line.startswith('.'):
-                        # Count parentheses from start to this point
-                        open_count = 0
-                        close_count = 0
-                        
-                        for k in range(i, j):
-                            open_count += lines[k].count('(')
-                            close_count += lines[k].count(')')
-                        
-                        # If parentheses are unbalanced, we need to add closing parenthesis
-                        if open_count > close_count:
-                            # Find the last non-empty, non-blank line before the modifier
-                            # This could be either j-1 or earlier if there are blank lines
-                            prev_line_idx = j - 1
-                            while prev_line_idx > i:
-                                # Skip empty lines
-                                if not lines[prev_line_idx].strip():
-                                    prev_line_idx -= 1
-                                    continue
-                                    
-                                # Found a non-empty line
-                                # Check if this line already ends with a closing parenthesis
-                                if not lines[prev_line_idx].rstrip().endswith(')'):
-                                    # Add the missing closing parenthesis
-                                    lines[prev_line_idx] = lines[prev_line_idx].rstrip() + ')'
-                                    print(f"[Syntax Validator] Added missing ) after line {prev_line_idx + 1}")
-                                break
-                            break
-        
-        for issue in issues:
-            if issue['issue'] == 'Orphaned closing parenthesis':
+        # Line inserts and typo renames are collected and applied after the
+        # loop; the validator reports every line-numbered issue before them
+        inserts: List[Tuple[int, str]] = []
+        typo_codes = set()
+        for issue_line, code in issues:
+            if code is IssueCode.ORPHAN_PAREN:
                 # Remove the orphaned parenthesis
-                line_num = issue['line'] - 1
+                line_num = issue_line - 1
                 if line_num < len(lines):
                     lines[line_num] = lines[line_num].replace(')', '', 1)
+                    lines_changed = True
             
-            elif issue['issue'] == 'Malformed ternary operator - missing true/false values':
+            elif code is IssueCode.MALFORMED_TERNARY:
                 # Fix malformed ternary by completing it
-                line_num = issue['line'] - 1
+                line_num = issue_line - 1
                 if line_num < len(lines):
                     line = lines[line_num]
                     # Replace "condition ?)" with complete ternary
@@ -241,59 +406,202 @@ class BasicSyntaxValidator:
                                 lines[line_num] = parts[0] + '? 1.0 : 0.5)' + parts[1]
                             else:
                                 lines[line_num] = parts[0] + '? true : false)' + parts[1]
+                            lines_changed = True
             
-            elif issue['issue'] == 'Missing import UIKit for haptic feedback':
-                # Add UIKit import after SwiftUI import
+            elif code is IssueCode.MISSING_UIKIT:
+                # Add UIKit import after SwiftUI import (inserted below)
                 for i, line in enumerate(lines):
                     if 'import SwiftUI' in line:
-                        lines.insert(i + 1, 'import UIKit')
+                        inserts.append((i + 1, 'import UIKit'))
                         break
             
-            elif issue['issue'] == '@Enviroment should be @Environment':
-                content = '\n'.join(lines)
-                content = content.replace('@Enviroment', '@Environment')
-                lines = content.split('\n')
+            elif code in _TYPO_FIX_CODES:
+                typo_codes.add(code)
+        
+        # Apply the deferred edits in one pass each: line inserts from the
+        # bottom up so earlier indices stay valid, then every typo rename in a
+        # single substitution over the joined text
+        for index, text in sorted(inserts, reverse=True):
+            lines.insert(index, text)
+            lines_changed = True
+        content = '\n'.join(lines)
+        if typo_codes:
+            content = _TYPO_FIX_RE.sub(
+                lambda m: _TYPO_FIXES[m.group()][1] if _TYPO_FIXES[m.group()][0] in typo_codes else m.group(),
+                content)
+        return content, lines_changed
+    
+    @staticmethod
+    def _fix_unclosed_parentheses(lines: List[str], code: List[str]) -> bool:
+        """
+        Add closing parentheses that LLM output commonly leaves out after
+        modifier closures and view initializers. Edits lines in place and
+        returns whether anything was added.
+        
+        All detection runs on code (the same lines with comments and string
+        literals blanked), so text inside literals can't trigger a fix.
+        """
+        n = len(lines)
+        changed = False
+        
+        def append_parens(k: int, missing: str) -> None:
+            nonlocal changed
+            changed = True
+            # Add ')' at the end of line k, or ahead of a trailing comment
+            end = len(code[k].rstrip())
+            if lines[k][end:].lstrip().startswith(('//', '/*')):
+                lines[k] = lines[k][:end] + missing + lines[k][end:].rstrip()
+            else:
+                lines[k] = lines[k].rstrip() + missing
+            code[k] = code[k][:end] + missing
+        
+        # Per-line parenthesis counts, taken once; the fixes below only ever
+        # append ')' to a line, so they update these in place
+        opens = [line.count('(') for line in code]
+        closes = [line.count(')') for line in code]
+        
+        # First handle modifier patterns with closures (like .gesture)
+        # This is CRITICAL for fixing common LLM generation errors
+        #
+        # A modifier's closure ends at the first later line that either has a
+        # '}' followed by a blank or modifier line, or (from the third line on)
+        # starts another structure. next_brace_end[j] / next_structure[j] give
+        # the first such line at or after j (n if none); appending ')' never
+        # changes either test, so they are computed once.
+        stripped = [line.strip() for line in code]
+        next_brace_end = [n] * (n + 1)
+        next_structure = [n] * (n + 1)
+        brace_end = structure = n
+        for j in range(n - 1, -1, -1):
+            line = code[j]
+            if '}' in line and (j + 1 >= n or not stripped[j + 1] or stripped[j + 1].startswith('.')):
+                brace_end = j
+            if 'struct ' in line or 'class ' in line or 'func ' in line or 'var body:' in line:
+                structure = j
+            next_brace_end[j] = brace_end
+            next_structure[j] = structure
+        
+        modifier_search = _MODIFIER_RE.search
+        for i in range(n):
+            # Check for modifiers that start a closure
+            if not modifier_search(code[i]):
+                continue
+            
+            # Found a modifier with potential closure; look for its end
+            # within the next 50 lines
+            closure_end = next_brace_end[min(i + 1, n)]
+            if i + 3 < n:
+                closure_end = min(closure_end, next_structure[i + 3])
+            if closure_end >= min(i + 50, n):
+                continue
+            
+            # Count all parentheses from this line through the closure end
+            open_count = sum(opens[i:closure_end + 1])
+            close_count = sum(closes[i:closure_end + 1])
             
-            elif 'forground should be foreground' in issue['issue']:
-                content = '\n'.join(lines)
-                content = content.replace('.forgroundColor', '.foregroundColor')
-                content = content.replace('.forgroundStyle', '.foregroundStyle')
-                lines = content.split('\n')
+            # If we found unbalanced parentheses
+            if open_count > close_count:
+                # Add the missing closing parenthesis at the end of the line
+                # with the closing brace
+                missing = ')' * (open_count - close_count)
+                append_parens(closure_end, missing)
+                closes[closure_end] += open_count - close_count
         
-        return '\n'.join(lines)
+        # Then handle view initializers whose closing parenthesis is missing
+        # before the first modifier line. Appending ')' never changes whether a
+        # line is blank or starts with '.', so the stripped lines still apply.
+        view_initializer_search = _VIEW_INITIALIZER_RE.search
+        for i in range(n):
+            # Check for view initializers that might have misplaced closing parenthesis
+            if not view_initializer_search(code[i]):
+                continue
+            
+            # Look ahead for a line that starts with a dot (SwiftUI modifier)
+            # while parentheses opened from line i onward are still unclosed
+            balance = 0
+            for j in range(i + 1, min(i + 15, n)):
+                balance += opens[j - 1] - closes[j - 1]
+                if not stripped[j].startswith('.'):
+                    continue
+                
+                # If parentheses are unbalanced, we need to add closing parenthesis
+                if balance > 0:
+                    # Find the last non-empty, non-blank line before the modifier
+                    # This could be either j-1 or earlier if there are blank lines
+                    prev_line_idx = j - 1
+                    while prev_line_idx > i:
+                        # Skip empty lines
+                        if not stripped[prev_line_idx]:
+                            prev_line_idx -= 1
+                            continue
+                        
+                        # Found a non-empty line
+                        # Check if this line already ends with a closing parenthesis
+                        if not code[prev_line_idx].rstrip().endswith(')'):
+                            # Add the missing closing parenthesis
+                            append_parens(prev_line_idx, ')')
+                            closes[prev_line_idx] += 1
+                            logger.debug("[Syntax Validator] Added missing ) after line %d", prev_line_idx + 1)
+                        break
+                    break
+        
+        return changed
 
 def validate_and_fix_swift(content: str) -> Tuple[str, List[Dict]]:
     """
     Validate and fix basic Swift syntax issues
     Returns: (fixed_content, issues_found)
     """
+    fixed_content, issues = _validate_and_fix_cached(content)
+    # Fresh issue dicts so callers can't mutate the cached entry
+    return fixed_content, issues.as_dicts()
+
+@functools.lru_cache(maxsize=128)
+def _find_issues(content: str) -> Issues:
+    """
+    Memoized scan_issues (callers must not mutate the result). The fixed output of one call is usually
+    validated again as-is (the pipeline fixes a file, then the build step
+    re-checks it on disk), so the second pass below seeds that lookup.
+    """
+    return BasicSyntaxValidator.scan_issues(content)
+
+@functools.lru_cache(maxsize=256)
+def _validate_and_fix_cached(content: str) -> Tuple[str, Issues]:
+    """Memoized validate-and-fix; the pipeline re-runs it on unchanged content"""
     import time
     start = time.time()
     
     validator = BasicSyntaxValidator()
-    issues = validator.validate_swift_file(content)
+    issues = _find_issues(content)
     
     elapsed = time.time() - start
     
     # ALWAYS run fix_basic_issues to catch LinearGradient and other structural issues
     # that may not be detected by validate_swift_file
-    fixed_content = validator.fix_basic_issues(content, issues)
+    fixed_content, lines_changed = validator._apply_fixes(content, issues)
     
     if issues:
-        print(f"[Syntax Validator] Found {len(issues)} syntax issues in {elapsed*1000:.1f}ms")
-        for issue in issues:
-            print(f"  Line {issue['line']}: {issue['issue']} ({issue['severity']})")
+        logger.info("[Syntax Validator] Found %d syntax issues in %.1fms", len(issues), elapsed * 1000)
+        if logger.isEnabledFor(logging.DEBUG):
+            for line, code in issues:
+                message, severity = _ISSUE_INFO[code]
+                logger.debug("  Line %d: %s (%s)", line, message, severity)
     
     # Check if content changed even without detected issues
     if fixed_content != content:
         if not issues:
-            print(f"[Syntax Validator] Applied structural fixes in {elapsed*1000:.1f}ms")
+            logger.info("[Syntax Validator] Applied structural fixes in %.1fms", elapsed * 1000)
         
-        # Validate again to see if fixes worked
-        remaining_issues = validator.validate_swift_file(fixed_content)
+        # Validate again to see if fixes worked. Typo renames touch no
+        # brackets, ternaries or imports, so if they were the only edits the
+        # remaining issues are just the non-typo ones found above.
+        if lines_changed:
+            remaining_issues = _find_issues(fixed_content)
+        else:
+            remaining_issues = issues.without(_TYPO_FIX_CODES)
         
         if issues and len(remaining_issues) < len(issues):
-            print(f"[Syntax Validator] Fixed {len(issues) - len(remaining_issues)} issues")
+            logger.info("[Syntax Validator] Fixed %d issues", len(issues) - len(remaining_issues))
         
         return fixed_content, remaining_issues
         
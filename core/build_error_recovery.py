@@ -5,11 +5,13 @@ Handles build-time errors that occur after successful compilation
 
 import os
 import re
+import asyncio
 import subprocess
 import plistlib
 import json
 import shutil
-from typing import Dict, List, Optional, Tuple
+import functools
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 
@@ -36,6 +38,122 @@ class BuildError:
     file_path: Optional[str] = None
     suggestion: Optional[str] = None
 
+# ASCII bytes not allowed in a bundle identifier (letters, digits, '.' and
+# '-' are kept); non-ASCII characters are dropped by the encode step
+_BUNDLE_ID_DELETE_BYTES = bytes(
+    i for i in range(128) if not (chr(i).isalnum() or chr(i) in '.-')
+)
+
+# Architectures named in `file` output for an executable
+_ARCH_RE = re.compile(rb'arm64|x86_64')
+
+# Characters of build output scanned from each end of a long log; triggers
+# only in the skipped middle are intentionally not detected
+_MAX_SCAN = 64 * 1024
+
+# Info.plist written for a bundle that lacks one; _info_plist_template fills
+# in the app-specific keys (None here). Arrays are tuples so the shared
+# template can't be mutated through a copy.
+_INFO_PLIST_TEMPLATE = {
+    'CFBundleExecutable': None,
+    'CFBundleIdentifier': None,
+    'CFBundleName': None,
+    'CFBundleDisplayName': None,
+    'CFBundlePackageType': 'APPL',
+    'CFBundleShortVersionString': '1.0',
+    'CFBundleVersion': '1',
+    'CFBundleInfoDictionaryVersion': '6.0',
+    'LSRequiresIPhoneOS': True,
+    'UILaunchStoryboardName': 'LaunchScreen',
+    'UIRequiredDeviceCapabilities': ('arm64',),
+    'UISupportedInterfaceOrientations': (
+        'UIInterfaceOrientationPortrait',
+        'UIInterfaceOrientationLandscapeLeft',
+        'UIInterfaceOrientationLandscapeRight'
+    ),
+    'UIApplicationSceneManifest': {
+        'UIApplicationSupportsMultipleScenes': False,
+        'UISceneConfigurations': {}
+    },
+    'DTCompiler': 'com.apple.compilers.llvm.clang.1_0',
+    'DTPlatformBuild': '',
+    'DTPlatformName': 'iphonesimulator',
+    'DTPlatformVersion': '16.0',
+    'DTSDKBuild': '20A360',
+    'DTSDKName': 'iphonesimulator16.0',
+    'MinimumOSVersion': '16.0',
+    'UIDeviceFamily': (1, 2)  # iPhone and iPad
+}
+
+# Error types fixed by editing the app bundle's Info.plist
+_INFO_PLIST_ERROR_TYPES = frozenset({
+    BuildErrorType.MISSING_INFO_PLIST,
+    BuildErrorType.INVALID_BUNDLE_ID,
+    BuildErrorType.CODE_SIGNING,
+})
+
+# Error types whose fixes act on the simulator rather than the app bundle
+_SIMULATOR_ERROR_TYPES = frozenset({
+    BuildErrorType.SIMULATOR_ERROR,
+    BuildErrorType.APP_INSTALL_FAILED,
+})
+
+# Order fixes are applied in: Info.plist edits first, so later fixes see a
+# valid bundle, and permissions after anything that writes the executable
+_FIX_ORDER = {error_type: rank for rank, error_type in enumerate((
+    BuildErrorType.MISSING_INFO_PLIST,
+    BuildErrorType.INVALID_BUNDLE_ID,
+    BuildErrorType.CODE_SIGNING,
+    BuildErrorType.MISSING_EXECUTABLE,
+    BuildErrorType.ARCHITECTURE_MISMATCH,
+    BuildErrorType.PERMISSION_DENIED,
+    BuildErrorType.SIMULATOR_ERROR,
+    BuildErrorType.APP_INSTALL_FAILED,
+))}
+
+# Build log signatures, checked in order: (error type, message, suggestion,
+# lowercase trigger groups that must all appear in the lowered output,
+# case-sensitive triggers any of which may appear in the raw output).
+# Separate substring tests beat a single multi-pattern pass here: each `in`
+# is a C-level search, while one alternation regex over a ~400 KB log runs
+# the regex engine per character and measured over 3x slower. Grouping
+# triggers by leading character only pays off for needles sharing a literal
+# prefix (sre then scans for the prefix); within each category below no two
+# triggers do, so every trigger keeps its own `in` test.
+_ERROR_SIGNATURES = (
+    (BuildErrorType.MISSING_INFO_PLIST, "Info.plist is missing or invalid", "Create proper Info.plist",
+     (), ("Info.plist", "CFBundleExecutable")),
+    (BuildErrorType.INVALID_BUNDLE_ID, "Invalid or missing bundle identifier", "Fix bundle identifier format",
+     (("bundle identifier",),), ("CFBundleIdentifier",)),
+    (BuildErrorType.MISSING_EXECUTABLE, "App executable is missing or invalid", "Rebuild executable",
+     (("executable",),), ("Mach-O",)),
+    (BuildErrorType.CODE_SIGNING, "Code signing failed", "Disable code signing for simulator",
+     (("code sign",),), ("codesign",)),
+    (BuildErrorType.SIMULATOR_ERROR, "Simulator error", "Reset simulator or use different device",
+     (("simulator",),), ("simctl",)),
+    (BuildErrorType.APP_INSTALL_FAILED, "App installation failed", "Clean and reinstall",
+     (("install", "failed"),), ()),
+    (BuildErrorType.ARCHITECTURE_MISMATCH, "Architecture mismatch", "Build for correct architecture",
+     (("architecture",),), ("arm64", "x86_64")),
+    (BuildErrorType.PERMISSION_DENIED, "Permission denied", "Fix file permissions",
+     (("permission denied",),), ()),
+)
+
+# Tool paths, resolved against $PATH once at import instead of on every spawn;
+# a tool missing at import falls back to its bare name and fails as before
+_XCRUN = shutil.which('xcrun') or 'xcrun'
+_SWIFTC = shutil.which('swiftc') or 'swiftc'
+_KILLALL = shutil.which('killall') or 'killall'
+_FILE = shutil.which('file') or 'file'
+_CHMOD = shutil.which('chmod') or 'chmod'
+
+@functools.lru_cache(maxsize=1)
+def _iphonesimulator_sdk_path() -> str:
+    """iphonesimulator SDK path; fixed for an Xcode install, so looked up once"""
+    return subprocess.check_output(
+        [_XCRUN, '--sdk', 'iphonesimulator', '--show-sdk-path']
+    ).decode().strip()
+
 class BuildErrorRecovery:
     """
     Comprehensive build error recovery system
@@ -50,6 +168,22 @@ class BuildErrorRecovery:
         self.recovery_attempts = 0
         self.max_attempts = 3
         
+        # bundle_id -> installation fixes attempted for it
+        self._install_fix_attempts: Dict[str, int] = {}
+        
+        # error type -> fixer taking (project_path, app_bundle, bundle_id);
+        # the Info.plist fixers are synchronous, the rest return coroutines
+        self._fixers: Dict[BuildErrorType, Callable[[str, str, str], Union[bool, Awaitable[bool]]]] = {
+            BuildErrorType.MISSING_INFO_PLIST: lambda project, bundle, bundle_id: self._fix_info_plist(bundle, bundle_id),
+            BuildErrorType.INVALID_BUNDLE_ID: lambda project, bundle, bundle_id: self._fix_bundle_id(bundle, bundle_id),
+            BuildErrorType.MISSING_EXECUTABLE: lambda project, bundle, bundle_id: self._fix_missing_executable(project, bundle),
+            BuildErrorType.CODE_SIGNING: lambda project, bundle, bundle_id: self._fix_code_signing(bundle),
+            BuildErrorType.SIMULATOR_ERROR: lambda project, bundle, bundle_id: self._fix_simulator_error(),
+            BuildErrorType.APP_INSTALL_FAILED: lambda project, bundle, bundle_id: self._fix_installation_error(bundle, bundle_id),
+            BuildErrorType.ARCHITECTURE_MISMATCH: lambda project, bundle, bundle_id: self._fix_architecture_mismatch(project, bundle),
+            BuildErrorType.PERMISSION_DENIED: lambda project, bundle, bundle_id: self._fix_permissions(bundle),
+        }
+        
     async def recover_from_build_error(
         self, 
         error_output: str, 
@@ -69,12 +203,40 @@ class BuildErrorRecovery:
             # Try to infer from symptoms
             errors = self._infer_errors_from_symptoms(project_path, app_bundle)
         
-        fixed_count = 0
+        # One fix per error type, applied in _FIX_ORDER
+        seen = set()
+        errors = [e for e in errors if not (e.error_type in seen or seen.add(e.error_type))]
+        errors.sort(key=lambda e: _FIX_ORDER.get(e.error_type, len(_FIX_ORDER)))
+        
         for error in errors:
             print(f"🔍 Detected: {error.error_type.value} - {error.message}")
-            
-            # Apply appropriate fix
-            if self._fix_build_error(error, project_path, app_bundle, bundle_id):
+        
+        # All Info.plist edits are applied together, with one load and one write
+        plist_error_types = [e.error_type for e in errors if e.error_type in _INFO_PLIST_ERROR_TYPES]
+        plist_fixed = None
+        results: Dict[int, bool] = {}
+        
+        async def apply_fixes(indices: List[int]) -> None:
+            nonlocal plist_fixed
+            for i in indices:
+                error = errors[i]
+                if error.error_type in _INFO_PLIST_ERROR_TYPES:
+                    if plist_fixed is None:
+                        plist_fixed = self._edit_info_plist(app_bundle, bundle_id, plist_error_types)
+                    results[i] = plist_fixed[error.error_type]
+                else:
+                    results[i] = await self._fix_build_error(error, project_path, app_bundle, bundle_id)
+        
+        # Fixes to the simulator and fixes to the app bundle on disk don't
+        # interact, so the two groups run concurrently; within a group fixes
+        # still run one at a time, in _FIX_ORDER
+        simulator_fixes = [i for i, e in enumerate(errors) if e.error_type in _SIMULATOR_ERROR_TYPES]
+        bundle_fixes = [i for i, e in enumerate(errors) if e.error_type not in _SIMULATOR_ERROR_TYPES]
+        await asyncio.gather(apply_fixes(bundle_fixes), apply_fixes(simulator_fixes))
+        
+        fixed_count = 0
+        for i, error in enumerate(errors):
+            if results[i]:
                 fixed_count += 1
                 print(f"✅ Fixed: {error.error_type.value}")
             else:
@@ -91,72 +253,26 @@ class BuildErrorRecovery:
         """Detect build errors from output"""
         errors = []
         
-        # Info.plist errors
-        if "Info.plist" in error_output or "CFBundleExecutable" in error_output:
-            errors.append(BuildError(
-                BuildErrorType.MISSING_INFO_PLIST,
-                "Info.plist is missing or invalid",
-                suggestion="Create proper Info.plist"
-            ))
-        
-        # Bundle ID errors
-        if "bundle identifier" in error_output.lower() or "CFBundleIdentifier" in error_output:
-            errors.append(BuildError(
-                BuildErrorType.INVALID_BUNDLE_ID,
-                "Invalid or missing bundle identifier",
-                suggestion="Fix bundle identifier format"
-            ))
-        
-        # Executable errors
-        if "executable" in error_output.lower() or "Mach-O" in error_output:
-            errors.append(BuildError(
-                BuildErrorType.MISSING_EXECUTABLE,
-                "App executable is missing or invalid",
-                suggestion="Rebuild executable"
-            ))
-        
-        # Code signing errors
-        if "code sign" in error_output.lower() or "codesign" in error_output:
-            errors.append(BuildError(
-                BuildErrorType.CODE_SIGNING,
-                "Code signing failed",
-                suggestion="Disable code signing for simulator"
-            ))
-        
-        # Simulator errors
-        if "simulator" in error_output.lower() or "simctl" in error_output:
-            errors.append(BuildError(
-                BuildErrorType.SIMULATOR_ERROR,
-                "Simulator error",
-                suggestion="Reset simulator or use different device"
-            ))
-        
-        # Installation errors
-        if "install" in error_output.lower() and "failed" in error_output.lower():
-            errors.append(BuildError(
-                BuildErrorType.APP_INSTALL_FAILED,
-                "App installation failed",
-                suggestion="Clean and reinstall"
-            ))
-        
-        # Architecture errors
-        if "architecture" in error_output.lower() or "arm64" in error_output or "x86_64" in error_output:
-            errors.append(BuildError(
-                BuildErrorType.ARCHITECTURE_MISMATCH,
-                "Architecture mismatch",
-                suggestion="Build for correct architecture"
-            ))
-        
-        # Permission errors
-        if "permission denied" in error_output.lower():
-            errors.append(BuildError(
-                BuildErrorType.PERMISSION_DENIED,
-                "Permission denied",
-                suggestion="Fix file permissions"
-            ))
+        # Setup failures show up at the start of a log and the final errors at
+        # its end; on huge logs skip the middle rather than scanning all of it
+        if len(error_output) > 2 * _MAX_SCAN:
+            error_output = error_output[:_MAX_SCAN] + "\n" + error_output[-_MAX_SCAN:]
+        
+        # Lowercase once for every case-insensitive trigger
+        lowered = error_output.lower()
+        
+        for error_type, message, suggestion, lower_triggers, raw_triggers in _ERROR_SIGNATURES:
+            if (any(all(needle in lowered for needle in group) for group in lower_triggers)
+                    or any(needle in error_output for needle in raw_triggers)):
+                errors.append(BuildError(error_type, message, suggestion=suggestion))
         
         return errors
     
+    @staticmethod
+    def _app_name(app_bundle: str) -> str:
+        """Executable name of an app bundle: its directory name without .app"""
+        return os.path.splitext(os.path.basename(app_bundle))[0]
+    
     def _infer_errors_from_symptoms(self, project_path: str, app_bundle: str) -> List[BuildError]:
         """Infer errors by checking the build artifacts"""
         errors = []
@@ -171,7 +287,7 @@ class BuildErrorRecovery:
                 ))
             
             # Check executable
-            app_name = os.path.basename(app_bundle).replace('.app', '')
+            app_name = self._app_name(app_bundle)
             executable_path = os.path.join(app_bundle, app_name)
             if not os.path.exists(executable_path):
                 errors.append(BuildError(
@@ -186,7 +302,7 @@ class BuildErrorRecovery:
         
         return errors
     
-    def _fix_build_error(
+    async def _fix_build_error(
         self, 
         error: BuildError, 
         project_path: str,
@@ -195,135 +311,143 @@ class BuildErrorRecovery:
     ) -> bool:
         """Apply fix for specific build error"""
         
-        if error.error_type == BuildErrorType.MISSING_INFO_PLIST:
-            return self._fix_info_plist(app_bundle, bundle_id)
-        
-        elif error.error_type == BuildErrorType.INVALID_BUNDLE_ID:
-            return self._fix_bundle_id(app_bundle, bundle_id)
-        
-        elif error.error_type == BuildErrorType.MISSING_EXECUTABLE:
-            return self._fix_missing_executable(project_path, app_bundle)
-        
-        elif error.error_type == BuildErrorType.CODE_SIGNING:
-            return self._fix_code_signing(app_bundle)
-        
-        elif error.error_type == BuildErrorType.SIMULATOR_ERROR:
-            return self._fix_simulator_error()
-        
-        elif error.error_type == BuildErrorType.APP_INSTALL_FAILED:
-            return self._fix_installation_error(app_bundle, bundle_id)
-        
-        elif error.error_type == BuildErrorType.ARCHITECTURE_MISMATCH:
-            return self._fix_architecture_mismatch(project_path, app_bundle)
-        
-        elif error.error_type == BuildErrorType.PERMISSION_DENIED:
-            return self._fix_permissions(app_bundle)
+        fixer = self._fixers.get(error.error_type)
+        if fixer is None:
+            return False
         
-        return False
+        result = fixer(project_path, app_bundle, bundle_id)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
     
     def _fix_info_plist(self, app_bundle: str, bundle_id: str) -> bool:
         """Create or fix Info.plist"""
-        if not app_bundle:
-            return False
-        
-        app_name = os.path.basename(app_bundle).replace('.app', '')
-        info_plist_path = os.path.join(app_bundle, "Info.plist")
-        
-        # Create comprehensive Info.plist
-        info_dict = {
-            'CFBundleExecutable': app_name,
-            'CFBundleIdentifier': bundle_id or f'com.swiftgen.{app_name.lower()}',
-            'CFBundleName': app_name,
-            'CFBundleDisplayName': app_name,
-            'CFBundlePackageType': 'APPL',
-            'CFBundleShortVersionString': '1.0',
-            'CFBundleVersion': '1',
-            'CFBundleInfoDictionaryVersion': '6.0',
-            'LSRequiresIPhoneOS': True,
-            'UILaunchStoryboardName': 'LaunchScreen',
-            'UIRequiredDeviceCapabilities': ['arm64'],
-            'UISupportedInterfaceOrientations': [
-                'UIInterfaceOrientationPortrait',
-                'UIInterfaceOrientationLandscapeLeft',
-                'UIInterfaceOrientationLandscapeRight'
-            ],
-            'UIApplicationSceneManifest': {
-                'UIApplicationSupportsMultipleScenes': False,
-                'UISceneConfigurations': {}
-            },
-            'DTCompiler': 'com.apple.compilers.llvm.clang.1_0',
-            'DTPlatformBuild': '',
-            'DTPlatformName': 'iphonesimulator',
-            'DTPlatformVersion': '16.0',
-            'DTSDKBuild': '20A360',
-            'DTSDKName': 'iphonesimulator16.0',
-            'MinimumOSVersion': '16.0',
-            'UIDeviceFamily': [1, 2]  # iPhone and iPad
-        }
-        
-        try:
-            with open(info_plist_path, 'wb') as f:
-                plistlib.dump(info_dict, f)
-            print(f"✅ Created Info.plist for {app_name}")
-            return True
-        except Exception as e:
-            print(f"❌ Failed to create Info.plist: {e}")
-            return False
+        error_type = BuildErrorType.MISSING_INFO_PLIST
+        return self._edit_info_plist(app_bundle, bundle_id, [error_type])[error_type]
     
     def _fix_bundle_id(self, app_bundle: str, bundle_id: str) -> bool:
         """Fix bundle identifier issues"""
+        error_type = BuildErrorType.INVALID_BUNDLE_ID
+        return self._edit_info_plist(app_bundle, bundle_id, [error_type])[error_type]
+    
+    def _edit_info_plist(
+        self,
+        app_bundle: str,
+        bundle_id: str,
+        error_types: List[BuildErrorType]
+    ) -> Dict[BuildErrorType, bool]:
+        """
+        Apply the Info.plist fixes for error_types, in order, to one in-memory
+        copy of the plist, reading and writing the file at most once.
+        Returns whether each fix succeeded.
+        """
+        results = {error_type: False for error_type in error_types}
         if not app_bundle:
-            return False
+            return results
         
         info_plist_path = os.path.join(app_bundle, "Info.plist")
         
-        try:
-            # Read existing or create new
-            if os.path.exists(info_plist_path):
+        # The template replaces the plist outright, so only load it when an
+        # earlier fix needs the existing contents
+        info_dict = None
+        original = None
+        unreadable = False
+        if error_types[0] != BuildErrorType.MISSING_INFO_PLIST and os.path.exists(info_plist_path):
+            try:
                 with open(info_plist_path, 'rb') as f:
                     info_dict = plistlib.load(f)
-            else:
-                info_dict = {}
-            
-            # Ensure valid bundle ID
-            app_name = os.path.basename(app_bundle).replace('.app', '')
-            if not bundle_id:
-                bundle_id = f"com.swiftgen.{app_name.lower()}"
-            
-            # Clean bundle ID (remove spaces, special chars)
-            bundle_id = re.sub(r'[^a-zA-Z0-9.-]', '', bundle_id)
-            
-            info_dict['CFBundleIdentifier'] = bundle_id
-            
-            with open(info_plist_path, 'wb') as f:
-                plistlib.dump(info_dict, f)
-            
-            print(f"✅ Fixed bundle ID: {bundle_id}")
-            return True
-        except Exception as e:
-            print(f"❌ Failed to fix bundle ID: {e}")
-            return False
+                # The fixes only set or remove top-level keys
+                original = dict(info_dict)
+            except Exception as e:
+                print(f"❌ Failed to read Info.plist: {e}")
+                unreadable = True
+        
+        edited = []
+        for error_type in error_types:
+            try:
+                if error_type == BuildErrorType.MISSING_INFO_PLIST:
+                    info_dict = self._info_plist_template(app_bundle, bundle_id)
+                    print(f"✅ Created Info.plist for {info_dict['CFBundleName']}")
+                elif error_type == BuildErrorType.CODE_SIGNING:
+                    info_dict = self._apply_code_signing(info_dict, app_bundle)
+                    if info_dict is None and unreadable:
+                        continue
+                    print("✅ Removed code signing requirements")
+                elif info_dict is None and unreadable:
+                    # Can't patch a plist that failed to load
+                    continue
+                else:
+                    info_dict = self._apply_bundle_id(info_dict, app_bundle, bundle_id)
+                    print(f"✅ Fixed bundle ID: {info_dict['CFBundleIdentifier']}")
+            except Exception as e:
+                print(f"❌ Failed to fix {error_type.value}: {e}")
+                continue
+            results[error_type] = True
+            if info_dict is not None:
+                edited.append(error_type)
+        
+        # Leave the file alone when the fixes found nothing to change (e.g.
+        # the bundle ID was already valid); rewriting costs more than the load
+        if edited and info_dict != original:
+            try:
+                with open(info_plist_path, 'wb') as f:
+                    plistlib.dump(info_dict, f, fmt=plistlib.FMT_BINARY)
+            except Exception as e:
+                print(f"❌ Failed to write Info.plist: {e}")
+                for error_type in edited:
+                    results[error_type] = False
+        
+        return results
     
-    def _fix_missing_executable(self, project_path: str, app_bundle: str) -> bool:
+    def _info_plist_template(self, app_bundle: str, bundle_id: str) -> Dict:
+        """Comprehensive Info.plist contents for the app bundle"""
+        app_name = self._app_name(app_bundle)
+        
+        # Shallow copy: the fixes only ever set or remove top-level keys
+        info_dict = dict(_INFO_PLIST_TEMPLATE)
+        info_dict['CFBundleExecutable'] = app_name
+        info_dict['CFBundleIdentifier'] = bundle_id or f'com.swiftgen.{app_name.lower()}'
+        info_dict['CFBundleName'] = app_name
+        info_dict['CFBundleDisplayName'] = app_name
+        return info_dict
+    
+    def _apply_bundle_id(self, info_dict: Optional[Dict], app_bundle: str, bundle_id: str) -> Dict:
+        """Set a valid CFBundleIdentifier on info_dict (a new dict if None)"""
+        if info_dict is None:
+            info_dict = {}
+        
+        # Ensure valid bundle ID
+        app_name = self._app_name(app_bundle)
+        if not bundle_id:
+            bundle_id = f"com.swiftgen.{app_name.lower()}"
+        
+        # Clean bundle ID (remove spaces, special chars)
+        bundle_id = bundle_id.encode('ascii', 'ignore').translate(None, _BUNDLE_ID_DELETE_BYTES).decode('ascii')
+        
+        info_dict['CFBundleIdentifier'] = bundle_id
+        return info_dict
+    
+    async def _fix_missing_executable(self, project_path: str, app_bundle: str) -> bool:
         """Rebuild missing executable"""
         if not app_bundle:
             return False
         
-        app_name = os.path.basename(app_bundle).replace('.app', '')
+        app_name = self._app_name(app_bundle)
         executable_path = os.path.join(app_bundle, app_name)
         
-        # Check if executable exists but wrong name
-        for file in os.listdir(app_bundle):
-            file_path = os.path.join(app_bundle, file)
-            if os.path.isfile(file_path) and os.access(file_path, os.X_OK):
-                if file != app_name:
-                    # Rename to correct name
-                    try:
-                        shutil.move(file_path, executable_path)
-                        print(f"✅ Renamed executable to {app_name}")
-                        return True
-                    except:
-                        pass
+        # Check if executable exists but wrong name (DirEntry.is_file uses
+        # the type from the directory listing, saving a stat per entry)
+        with os.scandir(app_bundle) as entries:
+            for entry in entries:
+                if entry.is_file() and os.access(entry.path, os.X_OK):
+                    if entry.name != app_name:
+                        # Rename to correct name
+                        try:
+                            shutil.move(entry.path, executable_path)
+                            print(f"✅ Renamed executable to {app_name}")
+                            return True
+                        except:
+                            pass
         
         # Try to recompile
         sources_dir = os.path.join(project_path, "Sources")
@@ -332,19 +456,18 @@ class BuildErrorRecovery:
             
             # Get SDK path
             try:
-                sdk_path = subprocess.check_output(
-                    ['xcrun', '--sdk', 'iphonesimulator', '--show-sdk-path']
-                ).decode().strip()
+                sdk_path = _iphonesimulator_sdk_path()
                 
-                swift_files = [
-                    os.path.join(sources_dir, f)
-                    for f in os.listdir(sources_dir)
-                    if f.endswith('.swift')
-                ]
+                with os.scandir(sources_dir) as entries:
+                    swift_files = [
+                        entry.path
+                        for entry in entries
+                        if entry.name.endswith('.swift')
+                    ]
                 
                 # Compile
                 compile_cmd = [
-                    'swiftc',
+                    _SWIFTC,
                     '-sdk', sdk_path,
                     '-target', 'x86_64-apple-ios16.0-simulator',
                     '-framework', 'SwiftUI',
@@ -355,14 +478,9 @@ class BuildErrorRecovery:
                     '-parse-as-library'
                 ] + swift_files
                 
-                result = subprocess.run(
-                    compile_cmd,
-                    capture_output=True,
-                    timeout=30,
-                    cwd=project_path
-                )
+                returncode, _ = await self._run(compile_cmd, timeout=30, cwd=project_path)
                 
-                if result.returncode == 0:
+                if returncode == 0:
                     os.chmod(executable_path, 0o755)
                     print(f"✅ Rebuilt executable: {app_name}")
                     return True
@@ -373,54 +491,75 @@ class BuildErrorRecovery:
     
     def _fix_code_signing(self, app_bundle: str) -> bool:
         """Fix code signing issues for simulator"""
-        if not app_bundle:
-            return False
-        
+        error_type = BuildErrorType.CODE_SIGNING
+        return self._edit_info_plist(app_bundle, None, [error_type])[error_type]
+    
+    def _apply_code_signing(self, info_dict: Optional[Dict], app_bundle: str) -> Optional[Dict]:
+        """
+        Drop the bundle's code signature and strip signing-related keys from
+        info_dict (None when there is no Info.plist, which is left alone)
+        """
+        # For simulator, we can disable code signing
+        # Create embedded provisioning profile placeholder
+        embedded_path = os.path.join(app_bundle, "_CodeSignature")
+        if os.path.exists(embedded_path):
+            shutil.rmtree(embedded_path)
+        
+        # Remove code signing requirements from Info.plist
+        if info_dict is not None:
+            # Remove signing-related keys
+            keys_to_remove = [
+                'CFBundleSignature',
+                'DTXcodeBuild',
+                'DTXcode'
+            ]
+            for key in keys_to_remove:
+                info_dict.pop(key, None)
+        
+        return info_dict
+    
+    async def _run(
+        self,
+        cmd: List[str],
+        timeout: Optional[float] = None,
+        cwd: Optional[str] = None,
+        check: bool = False
+    ) -> Tuple[int, bytes]:
+        """
+        Run a command without blocking the event loop.
+        Returns (returncode, stdout); kills the process on timeout.
+        """
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=cwd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
         try:
-            # For simulator, we can disable code signing
-            # Create embedded provisioning profile placeholder
-            embedded_path = os.path.join(app_bundle, "_CodeSignature")
-            if os.path.exists(embedded_path):
-                shutil.rmtree(embedded_path)
-            
-            # Remove code signing requirements from Info.plist
-            info_plist_path = os.path.join(app_bundle, "Info.plist")
-            if os.path.exists(info_plist_path):
-                with open(info_plist_path, 'rb') as f:
-                    info_dict = plistlib.load(f)
-                
-                # Remove signing-related keys
-                keys_to_remove = [
-                    'CFBundleSignature',
-                    'DTXcodeBuild',
-                    'DTXcode'
-                ]
-                for key in keys_to_remove:
-                    info_dict.pop(key, None)
-                
-                with open(info_plist_path, 'wb') as f:
-                    plistlib.dump(info_dict, f)
-            
-            print("✅ Removed code signing requirements")
-            return True
-        except Exception as e:
-            print(f"❌ Failed to fix code signing: {e}")
-            return False
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+        
+        if check and process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, cmd)
+        return process.returncode, stdout
     
-    def _fix_simulator_error(self) -> bool:
+    async def _simctl(self, *args: str) -> bytes:
+        """Run `xcrun simctl <args>` and return its stdout; never raises on failure status"""
+        _, stdout = await self._run([_XCRUN, 'simctl', *args])
+        return stdout
+    
+    async def _fix_simulator_error(self) -> bool:
         """Fix simulator-related errors"""
         try:
             # Kill and restart simulator
-            subprocess.run(['killall', 'Simulator'], capture_output=True)
+            await self._run([_KILLALL, 'Simulator'])
             
-            # Boot a fresh simulator
-            result = subprocess.run(
-                ['xcrun', 'simctl', 'list', 'devices', '-j'],
-                capture_output=True,
-                text=True
-            )
-            
-            devices = json.loads(result.stdout)
+            # Boot a fresh simulator; only available devices qualify, so let
+            # simctl filter the (often large) device list before serializing
+            devices = json.loads(await self._simctl('list', 'devices', 'available', '-j'))
             
             # Find an iPhone simulator
             for runtime, device_list in devices.get('devices', {}).items():
@@ -430,16 +569,10 @@ class BuildErrorRecovery:
                             device_id = device['udid']
                             
                             # Shutdown if booted
-                            subprocess.run(
-                                ['xcrun', 'simctl', 'shutdown', device_id],
-                                capture_output=True
-                            )
+                            await self._simctl('shutdown', device_id)
                             
                             # Boot fresh
-                            subprocess.run(
-                                ['xcrun', 'simctl', 'boot', device_id],
-                                capture_output=True
-                            )
+                            await self._simctl('boot', device_id)
                             
                             print(f"✅ Rebooted simulator: {device['name']}")
                             return True
@@ -449,21 +582,18 @@ class BuildErrorRecovery:
         
         return False
     
-    def _fix_installation_error(self, app_bundle: str, bundle_id: str) -> bool:
+    async def _fix_installation_error(self, app_bundle: str, bundle_id: str) -> bool:
         """Fix app installation errors"""
         if not bundle_id:
-            app_name = os.path.basename(app_bundle).replace('.app', '')
+            app_name = self._app_name(app_bundle)
             bundle_id = f"com.swiftgen.{app_name.lower()}"
         
+        attempts = self._install_fix_attempts.get(bundle_id, 0) + 1
+        self._install_fix_attempts[bundle_id] = attempts
+        
         try:
             # Get booted simulator
-            result = subprocess.run(
-                ['xcrun', 'simctl', 'list', 'devices', 'booted', '-j'],
-                capture_output=True,
-                text=True
-            )
-            
-            devices = json.loads(result.stdout)
+            devices = json.loads(await self._simctl('list', 'devices', 'booted', '-j'))
             
             for runtime, device_list in devices.get('devices', {}).items():
                 for device in device_list:
@@ -471,16 +601,16 @@ class BuildErrorRecovery:
                         device_id = device['udid']
                         
                         # Uninstall existing
-                        subprocess.run(
-                            ['xcrun', 'simctl', 'uninstall', device_id, bundle_id],
-                            capture_output=True
-                        )
+                        await self._simctl('uninstall', device_id, bundle_id)
                         
-                        # Clean simulator caches
-                        subprocess.run(
-                            ['xcrun', 'simctl', 'spawn', device_id, 'launchctl', 'kickstart', '-k', 'system/com.apple.CoreSimulator.CoreSimulatorService'],
-                            capture_output=True
-                        )
+                        # Clean simulator caches. Restarting CoreSimulatorService
+                        # is slow and disrupts every running simulator, so only
+                        # do it once a plain uninstall has already been tried
+                        if attempts >= 2:
+                            await self._simctl(
+                                'spawn', device_id, 'launchctl', 'kickstart', '-k',
+                                'system/com.apple.CoreSimulator.CoreSimulatorService'
+                            )
                         
                         print(f"✅ Cleaned simulator for fresh install")
                         return True
@@ -490,24 +620,21 @@ class BuildErrorRecovery:
         
         return False
     
-    def _fix_architecture_mismatch(self, project_path: str, app_bundle: str) -> bool:
+    async def _fix_architecture_mismatch(self, project_path: str, app_bundle: str) -> bool:
         """Fix architecture mismatch issues"""
         if not app_bundle:
             return False
         
-        app_name = os.path.basename(app_bundle).replace('.app', '')
+        app_name = self._app_name(app_bundle)
         executable_path = os.path.join(app_bundle, app_name)
         
         try:
             # Check current architecture
-            result = subprocess.run(
-                ['file', executable_path],
-                capture_output=True,
-                text=True
-            )
+            _, stdout = await self._run([_FILE, executable_path])
             
-            # Determine correct architecture
-            if 'arm64' in result.stdout and 'x86_64' not in result.stdout:
+            # Determine correct architecture from the slices `file` reports
+            archs = set(_ARCH_RE.findall(stdout))
+            if archs == {b'arm64'}:
                 # Need to rebuild for x86_64 (Intel simulator)
                 target_arch = 'x86_64-apple-ios16.0-simulator'
             else:
@@ -525,21 +652,21 @@ class BuildErrorRecovery:
             print(f"❌ Failed to fix architecture: {e}")
             return False
     
-    def _fix_permissions(self, app_bundle: str) -> bool:
+    async def _fix_permissions(self, app_bundle: str) -> bool:
         """Fix file permission issues"""
         if not app_bundle:
             return False
         
         try:
             # Fix app bundle permissions
-            subprocess.run(['chmod', '-R', '755', app_bundle], check=True)
+            await self._run([_CHMOD, '-R', '755', app_bundle], check=True)
             
             # Fix executable specifically
-            app_name = os.path.basename(app_bundle).replace('.app', '')
+            app_name = self._app_name(app_bundle)
             executable_path = os.path.join(app_bundle, app_name)
             
             if os.path.exists(executable_path):
-                subprocess.run(['chmod', '+x', executable_path], check=True)
+                await self._run([_CHMOD, '+x', executable_path], check=True)
             
             print("✅ Fixed file permissions")
             return True
@@ -550,67 +677,71 @@ class BuildErrorRecovery:
     
     def generate_diagnostic_report(self, project_path: str, app_bundle: str) -> str:
         """Generate detailed diagnostic report for debugging"""
-        report = "📋 Build Diagnostic Report\n"
-        report += "=" * 40 + "\n\n"
+        parts = ["📋 Build Diagnostic Report", "=" * 40, ""]
         
         # Check project structure
-        report += "Project Structure:\n"
+        parts.append("Project Structure:")
         if os.path.exists(project_path):
             sources_dir = os.path.join(project_path, "Sources")
             if os.path.exists(sources_dir):
-                files = os.listdir(sources_dir)
-                report += f"  Sources: {', '.join(files)}\n"
+                with os.scandir(sources_dir) as entries:
+                    files = [entry.name for entry in entries]
+                parts.append(f"  Sources: {', '.join(files)}")
             else:
-                report += "  ❌ No Sources directory\n"
+                parts.append("  ❌ No Sources directory")
         
         # Check app bundle
         if app_bundle and os.path.exists(app_bundle):
-            report += f"\nApp Bundle ({os.path.basename(app_bundle)}):\n"
+            parts.append("")
+            parts.append(f"App Bundle ({os.path.basename(app_bundle)}):")
             
             # Check Info.plist
             info_plist = os.path.join(app_bundle, "Info.plist")
             if os.path.exists(info_plist):
-                report += "  ✅ Info.plist exists\n"
+                parts.append("  ✅ Info.plist exists")
                 try:
                     with open(info_plist, 'rb') as f:
                         info = plistlib.load(f)
-                    report += f"    Bundle ID: {info.get('CFBundleIdentifier', 'Missing')}\n"
-                    report += f"    Executable: {info.get('CFBundleExecutable', 'Missing')}\n"
+                    parts.append(f"    Bundle ID: {info.get('CFBundleIdentifier', 'Missing')}")
+                    parts.append(f"    Executable: {info.get('CFBundleExecutable', 'Missing')}")
                 except:
-                    report += "    ❌ Could not parse Info.plist\n"
+                    parts.append("    ❌ Could not parse Info.plist")
             else:
-                report += "  ❌ No Info.plist\n"
+                parts.append("  ❌ No Info.plist")
             
             # Check executable
-            app_name = os.path.basename(app_bundle).replace('.app', '')
+            app_name = self._app_name(app_bundle)
             executable = os.path.join(app_bundle, app_name)
             if os.path.exists(executable):
-                report += f"  ✅ Executable exists: {app_name}\n"
+                parts.append(f"  ✅ Executable exists: {app_name}")
                 if os.access(executable, os.X_OK):
-                    report += "    ✅ Is executable\n"
+                    parts.append("    ✅ Is executable")
                 else:
-                    report += "    ❌ Not executable\n"
+                    parts.append("    ❌ Not executable")
             else:
-                report += f"  ❌ No executable: {app_name}\n"
+                parts.append(f"  ❌ No executable: {app_name}")
         else:
-            report += "\n❌ No app bundle found\n"
+            parts.append("")
+            parts.append("❌ No app bundle found")
         
         # Check simulator status
-        report += "\nSimulator Status:\n"
+        parts.append("")
+        parts.append("Simulator Status:")
         try:
             result = subprocess.run(
-                ['xcrun', 'simctl', 'list', 'devices', 'booted'],
+                [_XCRUN, 'simctl', 'list', 'devices', 'booted'],
                 capture_output=True,
                 text=True
             )
             if 'Booted' in result.stdout:
-                report += "  ✅ Simulator is booted\n"
+                parts.append("  ✅ Simulator is booted")
             else:
-                report += "  ❌ No booted simulator\n"
+                parts.append("  ❌ No booted simulator")
         except:
-            report += "  ❌ Could not check simulator\n"
+            parts.append("  ❌ Could not check simulator")
         
-        return report
+        parts.append("")
+        return "\n".join(parts)
 
 # Global instance
 build_error_recovery = BuildErrorRecovery()
\ No newline at end of file
@@ -4,11 +4,11 @@ Used by Netflix, Amazon, and every production system that doesn't want to die
 """
 
 import asyncio
+import sys
 import time
 from typing import Any, Callable, Optional
 from enum import Enum
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
 
 class CircuitState(Enum):
     CLOSED = "closed"      # Normal operation
@@ -21,7 +21,7 @@ class CircuitStats:
     total_calls: int = 0
     successful_calls: int = 0
     failed_calls: int = 0
-    last_failure_time: Optional[datetime] = None
+    last_failure_time: Optional[float] = None  # time.monotonic()
     consecutive_failures: int = 0
     
 class CircuitBreakerError(Exception):
@@ -58,7 +58,7 @@ class CircuitBreaker:
         
         self.state = CircuitState.CLOSED
         self.stats = CircuitStats()
-        self.last_state_change = datetime.now()
+        self.last_state_change = time.monotonic()
         self.half_open_calls = 0
     
     async def call(self, func: Callable, *args, **kwargs) -> Any:
@@ -77,11 +77,18 @@ class CircuitBreaker:
         self.stats.total_calls += 1
         
         try:
-            # Execute with timeout
-            result = await asyncio.wait_for(
-                func(*args, **kwargs),
-                timeout=self.timeout
-            )
+            # Execute with timeout; asyncio.timeout runs the call in this
+            # task instead of wrapping it in a new one like wait_for does
+            if self.timeout is not None and self.timeout <= 0:
+                raise asyncio.TimeoutError()
+            if sys.version_info >= (3, 11):
+                async with asyncio.timeout(self.timeout):
+                    result = await func(*args, **kwargs)
+            else:
+                result = await asyncio.wait_for(
+                    func(*args, **kwargs),
+                    timeout=self.timeout
+                )
             
             # Success - update state
             self._on_success()
@@ -116,10 +123,11 @@ class CircuitBreaker:
     def _update_state(self):
         """Update circuit state based on time and stats"""
         if self.state == CircuitState.OPEN:
-            if self._time_since_state_change() > self.reset_timeout:
+            now = time.monotonic()
+            if now - self.last_state_change > self.reset_timeout:
                 print(f"[Circuit Breaker] '{self.name}' moving to HALF_OPEN state")
                 self.state = CircuitState.HALF_OPEN
-                self.last_state_change = datetime.now()
+                self.last_state_change = now
                 self.half_open_calls = 0
     
     def _on_success(self):
@@ -130,23 +138,24 @@ class CircuitBreaker:
         if self.state == CircuitState.HALF_OPEN:
             print(f"[Circuit Breaker] '{self.name}' recovered, moving to CLOSED state")
             self.state = CircuitState.CLOSED
-            self.last_state_change = datetime.now()
+            self.last_state_change = time.monotonic()
     
     def _on_failure(self):
         """Handle failed call"""
         self.stats.failed_calls += 1
         self.stats.consecutive_failures += 1
-        self.stats.last_failure_time = datetime.now()
+        now = time.monotonic()
+        self.stats.last_failure_time = now
         
         if self.stats.consecutive_failures >= self.failure_threshold:
             if self.state != CircuitState.OPEN:
                 print(f"[Circuit Breaker] '{self.name}' opening after {self.stats.consecutive_failures} failures")
                 self.state = CircuitState.OPEN
-                self.last_state_change = datetime.now()
+                self.last_state_change = now
     
     def _time_since_state_change(self) -> float:
         """Time in seconds since last state change"""
-        return (datetime.now() - self.last_state_change).total_seconds()
+        return time.monotonic() - self.last_state_change
     
     def _time_until_retry(self) -> float:
         """Time in seconds until circuit might close"""
@@ -159,7 +168,7 @@ class CircuitBreaker:
         """Manually reset the circuit breaker"""
         self.state = CircuitState.CLOSED
         self.stats = CircuitStats()
-        self.last_state_change = datetime.now()
+        self.last_state_change = time.monotonic()
         self.half_open_calls = 0
         print(f"[Circuit Breaker] '{self.name}' manually reset")
     
@@ -4,7 +4,10 @@ Production-grade system that understands app complexity beyond simple keywords
 """
 
 import re
-from typing import Dict, List, Optional, Set, Tuple
+import dataclasses
+import functools
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -66,141 +69,230 @@ class ComplexityScore:
         else:
             return "claude"  # Complex architecture
 
+# Base complexity scores for app types
+_BASE_SCORES: Mapping = MappingProxyType({
+    AppType.TIMER: 10,
+    AppType.COUNTER: 8,
+    AppType.CALCULATOR: 15,
+    AppType.TODO: 20,
+    AppType.NOTES: 18,
+    AppType.WEATHER: 25,
+    AppType.CHAT: 35,
+    AppType.SOCIAL: 40,
+    AppType.ECOMMERCE: 45,
+    AppType.GAME: 30,
+    AppType.PRODUCTIVITY: 35,
+    AppType.UTILITY: 20,
+    AppType.CUSTOM: 25
+})
+
+# Feature complexity modifiers
+_FEATURE_MODIFIERS: Mapping = MappingProxyType({
+    # Authentication & User Management
+    'authentication': 25,
+    'login': 20,
+    'user profile': 15,
+    'registration': 15,
+    'oauth': 30,
+    'biometric': 20,
+    
+    # Data & Storage
+    'database': 20,
+    'core data': 25,
+    'cloudkit': 30,
+    'firebase': 25,
+    'realm': 20,
+    'cache': 10,
+    'offline': 15,
+    
+    # Networking
+    'api': 15,
+    'rest api': 15,
+    'graphql': 25,
+    'websocket': 30,
+    'real-time': 25,
+    'sync': 20,
+    'push notification': 25,
+    
+    # UI Complexity
+    'animation': 15,
+    'animations': 15,
+    'beautiful animation': 20,
+    'beautiful animations': 20,
+    'custom animation': 25,
+    'gesture': 15,
+    'drag and drop': 20,
+    'charts': 20,
+    'graphs': 20,
+    'map': 25,
+    'camera': 20,
+    'photo': 15,
+    'video': 25,
+    'ar': 35,
+    
+    # Advanced Features
+    'machine learning': 35,
+    'ai': 30,
+    'speech': 25,
+    'voice': 20,
+    'payment': 30,
+    'in-app purchase': 25,
+    'subscription': 20,
+    'sharing': 10,
+    'export': 10,
+    'import': 10,
+    
+    # Architecture
+    'mvvm': 10,
+    'coordinator': 15,
+    'dependency injection': 20,
+    'modular': 15,
+    
+    # Complexity Reducers (negative scores)
+    'simple': -10,
+    'basic': -8,
+    'minimal': -8,
+    'prototype': -5,
+    'demo': -5,
+    'example': -5
+})
+
+# UI element complexity
+_UI_COMPLEXITY: Mapping = MappingProxyType({
+    'tab': 5,
+    'navigation': 5,
+    'modal': 5,
+    'sheet': 5,
+    'popover': 8,
+    'sidebar': 10,
+    'split view': 12,
+    'collection': 10,
+    'grid': 10,
+    'carousel': 12,
+    'timeline': 15,
+    'calendar': 20,
+    'picker': 5,
+    'slider': 3,
+    'toggle': 2,
+    'form': 10,
+    'search': 8,
+    'filter': 10,
+    'sort': 8
+})
+
+# Compiled once at import; analyze() runs every pattern on each request.
+# Features and the short UI words match as whole words, so each one
+# can only match where its first word does: one pass of
+# _KEY_WORD_PATTERN finds the first words present in the text, and
+# only multi-word features starting with one of them need their own
+# search. The keys overlap ('api' / 'rest api', 'animation' /
+# 'animations'), which rules out one alternation over the full keys:
+# finditer never reports overlapping matches.
+# Features are stored as parallel columns in _FEATURE_MODIFIERS order,
+# indexed by first word so scoring only visits the candidates
+_FEATURE_NAMES = tuple(_FEATURE_MODIFIERS)
+_FEATURE_SCORES = tuple(_FEATURE_MODIFIERS.values())
+_FEATURE_PATTERNS = tuple(
+    re.compile(r'\b' + re.escape(feature) + r'\b', re.IGNORECASE) if re.search(r'\W', feature) else None
+    for feature in _FEATURE_NAMES
+)
+_FEATURE_FIRST_WORDS = tuple(re.split(r'\W', feature, 1)[0] for feature in _FEATURE_NAMES)
+_FEATURES_BY_FIRST_WORD: Dict[str, List[int]] = {
+    word: [index for index, first_word in enumerate(_FEATURE_FIRST_WORDS) if first_word == word]
+    for word in dict.fromkeys(_FEATURE_FIRST_WORDS)
+}
+
+# Short UI words need word boundaries; the rest match as substrings
+_UI_PATTERNS = tuple(
+    (element in ['search', 'filter', 'sort', 'form'], modifier, element)
+    for element, modifier in _UI_COMPLEXITY.items()
+)
+
+_KEY_WORDS = tuple(dict.fromkeys(
+    list(_FEATURES_BY_FIRST_WORD)
+    + [element for bounded, _, element in _UI_PATTERNS if bounded]
+))
+_KEY_WORD_PATTERN = re.compile(
+    r'\b(?:' + '|'.join('(' + re.escape(word) + ')' for word in _KEY_WORDS) + r')\b',
+    re.IGNORECASE
+)
+_KEY_WORD_SET = frozenset(_KEY_WORDS)
+_WORD_PATTERN = re.compile(r'\w+')
+_MULTIPLE_SCREENS_PATTERN = re.compile(r'\b(multiple|several|many)\s+(screens?|views?|pages?)\b')
+
+_TYPE_PATTERNS = {
+    AppType.TIMER: re.compile(r'\b(timer|countdown|stopwatch|alarm)\b'),
+    AppType.COUNTER: re.compile(r'\b(counter|tally|count|increment|decrement)\b'),
+    AppType.CALCULATOR: re.compile(r'\b(calculator|calculation|compute|math)\b'),
+    AppType.TODO: re.compile(r'\b(todo|task|checklist|to-do)\b'),
+    AppType.NOTES: re.compile(r'\b(notes?|memo|journal|diary)\b'),
+    AppType.WEATHER: re.compile(r'\b(weather|climate|forecast|temperature)\b'),
+    AppType.CHAT: re.compile(r'\b(chat|message|messaging|conversation)\b'),
+    AppType.SOCIAL: re.compile(r'\b(social|feed|post|follow|like|share)\b'),
+    AppType.ECOMMERCE: re.compile(r'\b(shop|store|product|cart|checkout|order)\b'),
+    AppType.GAME: re.compile(r'\b(game|play|score|level|puzzle)\b'),
+    AppType.PRODUCTIVITY: re.compile(r'\b(productivity|workflow|organize|manage)\b'),
+    AppType.UTILITY: re.compile(r'\b(utility|tool|converter|scanner)\b')
+}
+
+_TECH_PATTERNS = {
+    'async/await': (10, re.compile(r'\basync|await|concurrent\b')),
+    'combine': (15, re.compile(r'\bcombine|publisher|subscriber\b')),
+    'swiftui': (5, re.compile(r'\bswiftui\b')),
+    'uikit': (10, re.compile(r'\buikit\b')),
+    'metal': (25, re.compile(r'\bmetal|gpu\b')),
+    'core motion': (20, re.compile(r'\bmotion|accelerometer|gyroscope\b')),
+    'healthkit': (25, re.compile(r'\bhealthkit|health\sdata\b')),
+    'homekit': (25, re.compile(r'\bhomekit|smart\shome\b')),
+    'sirikit': (20, re.compile(r'\bsiri|voice\sassistant\b')),
+    'widgets': (20, re.compile(r'\bwidget|home\sscreen\b')),
+    'watch app': (30, re.compile(r'\bwatch\sapp|watchos\b')),
+    'ipad': (15, re.compile(r'\bipad|tablet\b')),
+    'mac catalyst': (20, re.compile(r'\bmac|catalyst|desktop\b'))
+}
+
+_AUTH_PATTERN = re.compile(r'\b(auth|login|signin|signup|register|user\saccount|password|oauth|biometric)\b')
+_NETWORK_PATTERN = re.compile(r'\b(api|rest|graphql|websocket|http|network|online|cloud|sync|fetch|download|upload)\b')
+_PERSIST_PATTERN = re.compile(r'\b(save|store|database|cache|persist|core\sdata|realm|sqlite|offline|local\sstorage)\b')
+_REALTIME_PATTERN = re.compile(r'\b(real[\s-]?time|live|stream|websocket|push|instant|sync)\b')
+_ANIMATION_PATTERN = re.compile(r'\b(animat|transition|gesture|drag|swipe|bounce|spring|fade|slide)\b')
+
 class ComplexityAnalyzer:
     """Production-grade complexity analyzer with nuanced scoring"""
     
-    def __init__(self):
-        # Base complexity scores for app types
-        self.base_scores = {
-            AppType.TIMER: 10,
-            AppType.COUNTER: 8,
-            AppType.CALCULATOR: 15,
-            AppType.TODO: 20,
-            AppType.NOTES: 18,
-            AppType.WEATHER: 25,
-            AppType.CHAT: 35,
-            AppType.SOCIAL: 40,
-            AppType.ECOMMERCE: 45,
-            AppType.GAME: 30,
-            AppType.PRODUCTIVITY: 35,
-            AppType.UTILITY: 20,
-            AppType.CUSTOM: 25
-        }
-        
-        # Feature complexity modifiers
-        self.feature_modifiers = {
-            # Authentication & User Management
-            'authentication': 25,
-            'login': 20,
-            'user profile': 15,
-            'registration': 15,
-            'oauth': 30,
-            'biometric': 20,
-            
-            # Data & Storage
-            'database': 20,
-            'core data': 25,
-            'cloudkit': 30,
-            'firebase': 25,
-            'realm': 20,
-            'cache': 10,
-            'offline': 15,
-            
-            # Networking
-            'api': 15,
-            'rest api': 15,
-            'graphql': 25,
-            'websocket': 30,
-            'real-time': 25,
-            'sync': 20,
-            'push notification': 25,
-            
-            # UI Complexity
-            'animation': 15,
-            'animations': 15,
-            'beautiful animation': 20,
-            'beautiful animations': 20,
-            'custom animation': 25,
-            'gesture': 15,
-            'drag and drop': 20,
-            'charts': 20,
-            'graphs': 20,
-            'map': 25,
-            'camera': 20,
-            'photo': 15,
-            'video': 25,
-            'ar': 35,
-            
-            # Advanced Features
-            'machine learning': 35,
-            'ai': 30,
-            'speech': 25,
-            'voice': 20,
-            'payment': 30,
-            'in-app purchase': 25,
-            'subscription': 20,
-            'sharing': 10,
-            'export': 10,
-            'import': 10,
-            
-            # Architecture
-            'mvvm': 10,
-            'coordinator': 15,
-            'dependency injection': 20,
-            'modular': 15,
-            
-            # Complexity Reducers (negative scores)
-            'simple': -10,
-            'basic': -8,
-            'minimal': -8,
-            'prototype': -5,
-            'demo': -5,
-            'example': -5
-        }
-        
-        # UI element complexity
-        self.ui_complexity = {
-            'tab': 5,
-            'navigation': 5,
-            'modal': 5,
-            'sheet': 5,
-            'popover': 8,
-            'sidebar': 10,
-            'split view': 12,
-            'collection': 10,
-            'grid': 10,
-            'carousel': 12,
-            'timeline': 15,
-            'calendar': 20,
-            'picker': 5,
-            'slider': 3,
-            'toggle': 2,
-            'form': 10,
-            'search': 8,
-            'filter': 10,
-            'sort': 8
-        }
-    
     def analyze(self, description: str, app_name: str = "") -> ComplexityScore:
         """
         Analyze app complexity from description
         Returns detailed complexity score and breakdown
         """
+        score = _analyze_cached(description, app_name)
+        # Fresh lists so callers can't mutate the cached entry
+        return dataclasses.replace(
+            score,
+            detected_features=list(score.detected_features),
+            technical_requirements=list(score.technical_requirements),
+            ui_elements=list(score.ui_elements),
+            external_dependencies=list(score.external_dependencies)
+        )
+    
+    def _analyze(self, description: str, app_name: str) -> ComplexityScore:
+        """Uncached analyze()"""
         description_lower = description.lower()
-        combined = f"{description} {app_name}".lower()
+        combined = f"{description_lower} {app_name.lower()}" if app_name else description_lower
         
         # Detect app type
         app_type = self._detect_app_type(combined)
-        base_score = self.base_scores.get(app_type, 25)
+        base_score = _BASE_SCORES.get(app_type, 25)
         
         # Analyze features
-        feature_score, features = self._analyze_features(description_lower)
+        key_words = self._find_key_words(description_lower)
+        feature_score, features = self._analyze_features(description_lower, key_words)
         
         # Analyze technical requirements
         tech_score, tech_reqs = self._analyze_technical(description_lower)
         
         # Analyze UI complexity
-        ui_score, ui_elements = self._analyze_ui(description_lower)
+        ui_score, ui_elements = self._analyze_ui(description_lower, key_words)
         
         # Detect special requirements
         has_auth = self._has_authentication(description_lower)
@@ -235,80 +327,60 @@ class ComplexityAnalyzer:
     
     def _detect_app_type(self, text: str) -> AppType:
         """Detect base app type from description"""
-        type_patterns = {
-            AppType.TIMER: r'\b(timer|countdown|stopwatch|alarm)\b',
-            AppType.COUNTER: r'\b(counter|tally|count|increment|decrement)\b',
-            AppType.CALCULATOR: r'\b(calculator|calculation|compute|math)\b',
-            AppType.TODO: r'\b(todo|task|checklist|to-do)\b',
-            AppType.NOTES: r'\b(notes?|memo|journal|diary)\b',
-            AppType.WEATHER: r'\b(weather|climate|forecast|temperature)\b',
-            AppType.CHAT: r'\b(chat|message|messaging|conversation)\b',
-            AppType.SOCIAL: r'\b(social|feed|post|follow|like|share)\b',
-            AppType.ECOMMERCE: r'\b(shop|store|product|cart|checkout|order)\b',
-            AppType.GAME: r'\b(game|play|score|level|puzzle)\b',
-            AppType.PRODUCTIVITY: r'\b(productivity|workflow|organize|manage)\b',
-            AppType.UTILITY: r'\b(utility|tool|converter|scanner)\b'
-        }
-        
-        for app_type, pattern in type_patterns.items():
-            if re.search(pattern, text):
+        for app_type, pattern in _TYPE_PATTERNS.items():
+            if pattern.search(text):
                 return app_type
         
         return AppType.CUSTOM
     
-    def _analyze_features(self, text: str) -> Tuple[int, List[str]]:
+    def _find_key_words(self, text: str) -> Set[str]:
+        """First words of features and bounded UI elements present in text"""
+        if text.isascii():
+            # In ASCII text a key word matches exactly when it is one of the
+            # \w+ tokens, so a set lookup per token replaces the alternation
+            # (which tries every key at every position). Non-ASCII text keeps
+            # the regex: IGNORECASE also matches e.g. 'ſ' for 's'
+            return _KEY_WORD_SET.intersection(_WORD_PATTERN.findall(text.lower()))
+        return {_KEY_WORDS[match.lastindex - 1] for match in _KEY_WORD_PATTERN.finditer(text)}
+    
+    def _analyze_features(self, text: str, key_words: Set[str]) -> Tuple[int, List[str]]:
         """Analyze feature complexity"""
-        score = 0
-        detected = []
+        # Word-boundary matches for more accurate detection
+        hits = []
+        for word in key_words:
+            for index in _FEATURES_BY_FIRST_WORD.get(word, ()):
+                pattern = _FEATURE_PATTERNS[index]
+                if pattern is None or pattern.search(text):
+                    hits.append(index)
+        hits.sort()
         
-        for feature, modifier in self.feature_modifiers.items():
-            # Use word boundaries for more accurate detection
-            pattern = r'\b' + re.escape(feature) + r'\b'
-            if re.search(pattern, text, re.IGNORECASE):
-                score += modifier
-                if modifier > 0:  # Only track positive features
-                    detected.append(feature)
+        score = sum(_FEATURE_SCORES[index] for index in hits)
+        # Only track positive features
+        detected = [_FEATURE_NAMES[index] for index in hits if _FEATURE_SCORES[index] > 0]
         
         return score, detected
     
     def _analyze_technical(self, text: str) -> Tuple[int, List[str]]:
         """Analyze technical requirements"""
-        tech_patterns = {
-            'async/await': (10, r'\basync|await|concurrent\b'),
-            'combine': (15, r'\bcombine|publisher|subscriber\b'),
-            'swiftui': (5, r'\bswiftui\b'),
-            'uikit': (10, r'\buikit\b'),
-            'metal': (25, r'\bmetal|gpu\b'),
-            'core motion': (20, r'\bmotion|accelerometer|gyroscope\b'),
-            'healthkit': (25, r'\bhealthkit|health\sdata\b'),
-            'homekit': (25, r'\bhomekit|smart\shome\b'),
-            'sirikit': (20, r'\bsiri|voice\sassistant\b'),
-            'widgets': (20, r'\bwidget|home\sscreen\b'),
-            'watch app': (30, r'\bwatch\sapp|watchos\b'),
-            'ipad': (15, r'\bipad|tablet\b'),
-            'mac catalyst': (20, r'\bmac|catalyst|desktop\b')
-        }
-        
         score = 0
         detected = []
         
-        for tech, (modifier, pattern) in tech_patterns.items():
-            if re.search(pattern, text):
+        for tech, (modifier, pattern) in _TECH_PATTERNS.items():
+            if pattern.search(text):
                 score += modifier
                 detected.append(tech)
         
         return score, detected
     
-    def _analyze_ui(self, text: str) -> Tuple[int, List[str]]:
+    def _analyze_ui(self, text: str, key_words: Set[str]) -> Tuple[int, List[str]]:
         """Analyze UI complexity"""
         score = 0
         detected = []
         
-        for element, modifier in self.ui_complexity.items():
+        for bounded, modifier, element in _UI_PATTERNS:
             # More precise matching with word boundaries where appropriate
-            if element in ['search', 'filter', 'sort', 'form']:
-                pattern = r'\b' + element + r'\b'
-                if re.search(pattern, text, re.IGNORECASE):
+            if bounded:
+                if element in key_words:
                     score += modifier
                     detected.append(element)
             elif element in text:
@@ -316,7 +388,7 @@ class ComplexityAnalyzer:
                 detected.append(element)
         
         # Check for multiple screens/views
-        if re.search(r'\b(multiple|several|many)\s+(screens?|views?|pages?)\b', text):
+        if _MULTIPLE_SCREENS_PATTERN.search(text):
             score += 15
             detected.append('multiple screens')
         
@@ -324,28 +396,23 @@ class ComplexityAnalyzer:
     
     def _has_authentication(self, text: str) -> bool:
         """Check if app requires authentication"""
-        auth_patterns = r'\b(auth|login|signin|signup|register|user\saccount|password|oauth|biometric)\b'
-        return bool(re.search(auth_patterns, text))
+        return bool(_AUTH_PATTERN.search(text))
     
     def _has_networking(self, text: str) -> bool:
         """Check if app requires networking"""
-        network_patterns = r'\b(api|rest|graphql|websocket|http|network|online|cloud|sync|fetch|download|upload)\b'
-        return bool(re.search(network_patterns, text))
+        return bool(_NETWORK_PATTERN.search(text))
     
     def _has_persistence(self, text: str) -> bool:
         """Check if app requires data persistence"""
-        persist_patterns = r'\b(save|store|database|cache|persist|core\sdata|realm|sqlite|offline|local\sstorage)\b'
-        return bool(re.search(persist_patterns, text))
+        return bool(_PERSIST_PATTERN.search(text))
     
     def _has_realtime(self, text: str) -> bool:
         """Check if app requires real-time features"""
-        realtime_patterns = r'\b(real[\s-]?time|live|stream|websocket|push|instant|sync)\b'
-        return bool(re.search(realtime_patterns, text))
+        return bool(_REALTIME_PATTERN.search(text))
     
     def _has_animations(self, text: str) -> bool:
         """Check if app requires animations"""
-        animation_patterns = r'\b(animat|transition|gesture|drag|swipe|bounce|spring|fade|slide)\b'
-        return bool(re.search(animation_patterns, text))
+        return bool(_ANIMATION_PATTERN.search(text))
     
     def _apply_combination_modifiers(
         self, 
@@ -387,3 +454,12 @@ class ComplexityAnalyzer:
             'validation_level': 'comprehensive' if score.total > 60 else 'standard'
         }
 
+@functools.lru_cache(maxsize=256)
+def _analyze_cached(description: str, app_name: str) -> ComplexityScore:
+    """
+    Memoized ComplexityAnalyzer._analyze (callers must not mutate the result).
+    Retries and routing re-analyze the same request, and scoring only reads
+    the module-level tables, so one cache serves every analyzer.
+    cache_clear() resets it
+    """
+    return ComplexityAnalyzer()._analyze(description, app_name)